@@ -168,6 +168,10 @@ class XuanDaoSystem:
             "壬": "water", "癸": "water"
         }
 
+        # Sixty Jiazi cycle - the stems and branches advance together, built once
+        self.sixty_jiazi_cycle = tuple(f"{self.heavenly_stems[i % 10]}{self.earthly_branches[i % 12]}"
+                                       for i in range(60))
+
         # Mapping between branches and phases
         self.branch_phase_mapping = {
             "寅": "wood", "卯": "wood",
@@ -203,12 +207,7 @@ class XuanDaoSystem:
 
     def get_sixty_jiazi_cycle(self):
         """Get the sixty combinations of Heavenly Stems and Earthly Branches."""
-        cycle = []
-        for i in range(60):
-            stem_idx = i % 10
-            branch_idx = i % 12
-            cycle.append(f"{self.heavenly_stems[stem_idx]}{self.earthly_branches[branch_idx]}")
-        return cycle
+        return self.sixty_jiazi_cycle
 
     def calculate_flying_star_chart(self, facing_direction, period_number=8):
         """
@@ -248,14 +247,9 @@ class XuanDaoSystem:
 
     def generate_hexagram(self):
         """Generate a random hexagram."""
-        lines = []
-        hexagram_number = 0
-
-        for i in range(6):
-            # 0: yin, 1: yang
-            line = random.randint(0, 1)
-            lines.append(line)
-            hexagram_number += line * (2 ** i)
+        # One draw of six random bits, line i in bit i (0: yin, 1: yang)
+        hexagram_number = random.getrandbits(6)
+        lines = [(hexagram_number >> i) & 1 for i in range(6)]
 
         # Return the lines and the corresponding hexagram number (0-63)
         return lines, hexagram_number
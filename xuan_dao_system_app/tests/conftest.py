@@ -0,0 +1,6 @@
+# 🧪 XUÁN DÀO TESTS: THE MODULES LIVE ONE LEVEL UP 🧪
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
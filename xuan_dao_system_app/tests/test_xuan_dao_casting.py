@@ -0,0 +1,72 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from xuan_dao_structures import HexagramCode
+from xuan_dao_core import XuanDaoCore
+from xuan_dao_casting import XuanDaoCastingAnalysis, XuanDaoKeyedCasting, philox4x32
+
+
+QUESTION = "Should I begin the journey?"
+
+
+@pytest.fixture(scope="module")
+def keyed_casting():
+    return XuanDaoKeyedCasting(XuanDaoCore())
+
+
+# Philox4x32-10 known-answer vectors from the Random123 distribution (kat_vectors)
+@pytest.mark.parametrize("counter, key, expected", [
+    ([0x00000000] * 4, [0x00000000] * 2,
+     [0x6627e8d5, 0xe169c58d, 0xbc57ac4c, 0x9b00dbd8]),
+    ([0xffffffff] * 4, [0xffffffff] * 2,
+     [0x408f276d, 0x41c83b0e, 0xa20bc7c6, 0x6d5451fd]),
+    ([0x243f6a88, 0x85a308d3, 0x13198a2e, 0x03707344], [0xa4093822, 0x299f31d0],
+     [0xd16cfe09, 0x94fdcceb, 0x5001e420, 0x24126ea1]),
+])
+def test_philox_known_answers(counter, key, expected):
+    words = philox4x32(np.array(counter, dtype=np.uint32), np.array(key, dtype=np.uint32))
+    assert words.tolist() == expected
+
+
+def test_philox_batch_matches_single_blocks():
+    rng = np.random.default_rng(0)
+    counters = rng.integers(0, 2 ** 32, (8, 4), dtype=np.uint32)
+    keys = rng.integers(0, 2 ** 32, (8, 2), dtype=np.uint32)
+
+    batch = philox4x32(counters, keys)
+    for counter, key, words in zip(counters, keys, batch):
+        assert philox4x32(counter, key).tolist() == words.tolist()
+
+
+def test_cast_keyed_is_stable(keyed_casting):
+    assert keyed_casting.cast_key("user-1", keyed_casting.question_hash(QUESTION), 1700000000) == \
+        (4138122448, 2119057536)
+    assert keyed_casting.cast_keyed("user-1", QUESTION, 1700000000) == HexagramCode(53, 21)
+
+    when = datetime.datetime(2024, 2, 10, 9, 30, tzinfo=datetime.timezone.utc)
+    assert keyed_casting.cast_keyed("user-1", QUESTION, when, cast_index=1) == HexagramCode(41, 42)
+
+
+def test_cast_keyed_batch_matches_single_casts(keyed_casting):
+    readings = [("user-1", QUESTION, 1700000000), ("user-2", QUESTION, 1700000000), ("user-1", "Another?", 1)]
+    keys = np.array([keyed_casting.cast_key(user_id, keyed_casting.question_hash(question), timestamp)
+                     for user_id, question, timestamp in readings], dtype=np.uint32)
+
+    codes, changing = keyed_casting.cast_keyed_batch(keys)
+    for reading, code, mask in zip(readings, codes, changing):
+        assert keyed_casting.cast_keyed(*reading) == HexagramCode(int(code), int(mask))
+
+
+@pytest.mark.parametrize("method", [[1, 1, 1, 1, 1], [1, 1, 1], [1, -1, 1, 1], [0, 0, 0, 0], [1, np.nan, 1, 1], "coin"])
+def test_distribution_rejects_invalid_methods(keyed_casting, method):
+    with pytest.raises(ValueError):
+        XuanDaoCastingAnalysis(keyed_casting.core).distribution(method)
+
+
+def test_distribution_marginals(keyed_casting):
+    distribution = XuanDaoCastingAnalysis(keyed_casting.core).distribution("coins")
+    assert distribution.pair_probabilities.sum() == pytest.approx(1.0)
+    np.testing.assert_allclose(distribution.primary, np.full(64, 1 / 64))
+    assert distribution.expected_changing_lines == pytest.approx(1.5)
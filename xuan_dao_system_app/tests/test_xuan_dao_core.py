@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from xuan_dao_structures import HexagramCode
+from xuan_dao_core import XuanDaoCore
+
+
+@pytest.fixture(scope="module")
+def core():
+    return XuanDaoCore()
+
+
+@pytest.mark.parametrize("method", [
+    [1, 1, 1, 1, 1],  # A fifth line value past old yang
+    [1, 1, 1],  # Old yang could never be cast
+    [],
+    [[1, 1], [1, 1]],
+    [1, -1, 1, 1],
+    [1, np.nan, 1, 1],
+    [1, np.inf, 1, 1],
+    [0, 0, 0, 0],
+    "coin",
+])
+def test_casting_rejects_invalid_methods(core, method):
+    rng = np.random.default_rng(0)
+    with pytest.raises(ValueError):
+        core.cast_hexagram(method, rng)
+    with pytest.raises(ValueError):
+        core.cast_hexagrams(10, method, rng)
+
+
+def test_custom_casting_method(core):
+    # Weights need not be normalized; with no old lines nothing changes
+    codes, changing = core.cast_hexagrams(1000, [0, 3, 1, 0], np.random.default_rng(0))
+    assert not changing.any()
+    assert isinstance(core.cast_hexagram([1, 1, 1, 1], np.random.default_rng(0)), HexagramCode)
@@ -0,0 +1,68 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from xuan_dao_structures import ElementRelation, SeasonalStrength, ELEMENT_CODES
+from xuan_dao_core import XuanDaoCore
+from xuan_dao_scheduling import XuanDaoScheduler
+
+
+@pytest.fixture(scope="module")
+def core():
+    return XuanDaoCore()
+
+
+def test_group_scores_match_personal_scores(core):
+    scheduler = XuanDaoScheduler(core)
+    birth = datetime.date(1990, 7, 20)
+    balance = core.calculate_element_balance(birth.year, birth.month, birth.day)
+    start, end = datetime.date(2024, 1, 20), datetime.date(2024, 2, 20)
+
+    ranked = scheduler.rank_days(balance, start, end, k=5)
+    group = scheduler.optimize_group_days(np.array([birth], dtype="datetime64[D]"), start, end, k=5,
+                                          control_penalty=0.0)
+    assert [day.date for day in group] == [day.date for day in ranked]
+    np.testing.assert_allclose([day.mean_support for day in group], [day.score for day in ranked], rtol=1e-6)
+
+
+def test_group_days_reject_empty_groups_and_windows(core):
+    scheduler = XuanDaoScheduler(core)
+    births = np.array(["1984-03-01", "1990-07-20"], dtype="datetime64[D]")
+
+    with pytest.raises(ValueError):
+        scheduler.optimize_group_days(births[:0], datetime.date(2024, 1, 1), datetime.date(2024, 2, 1))
+    with pytest.raises(ValueError):
+        scheduler.optimize_group_days(births, datetime.date(2024, 2, 1), datetime.date(2024, 1, 1))
+
+
+def daily_energy_score(core, scheduler, balance, date):
+    """Score a day from the qualities calculate_daily_energy reports for it"""
+    energy = core.calculate_daily_energy(date.year, date.month, date.day)
+    day_element = energy.stem_branch.combined_element
+    relation = ElementRelation(core.relation(ELEMENT_CODES[day_element], ELEMENT_CODES[balance.weakest]))
+    strength = SeasonalStrength(core.seasonal_strength[date.month - 1, ELEMENT_CODES[day_element]])
+
+    return (scheduler.weakest_support[relation] * core.seasonal_strength_weights[strength]
+            + scheduler.recommended_bonus * (day_element == balance.recommended)
+            - scheduler.excess_penalty * (day_element == balance.strongest)
+            + sum(scheduler.quality_weights[quality] for quality in energy.quality))
+
+
+def test_rank_days_matches_daily_energy_across_season_boundary(core):
+    scheduler = XuanDaoScheduler(core)
+    balance = core.calculate_element_balance(1984, 3, 1)
+    start, end = datetime.date(2024, 1, 15), datetime.date(2024, 3, 15)
+
+    dates = [start + datetime.timedelta(days=offset) for offset in range((end - start).days + 1)]
+    expected = np.array([daily_energy_score(core, scheduler, balance, date) for date in dates])
+
+    # The window must actually cross a change of season alignment
+    qualities = {quality for date in dates
+                 for quality in core.calculate_daily_energy(date.year, date.month, date.day).quality}
+    assert "In season, naturally supported energy" in qualities
+    assert "Against seasonal energy, requiring adaptation" in qualities
+
+    ranked = scheduler.rank_days(balance, start, end, k=len(dates))
+    assert [day.date for day in ranked] == [dates[i] for i in np.argsort(-expected, kind="stable")]
+    np.testing.assert_allclose([day.score for day in ranked], np.sort(expected)[::-1], rtol=1e-6)
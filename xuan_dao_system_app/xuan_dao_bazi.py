@@ -0,0 +1,415 @@
+# 🀄 XUÁN DÀO BAZI: THE FOUR PILLARS OF DESTINY 🀄
+
+import datetime
+import itertools
+
+import numpy as np
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from xuan_dao_structures import FourPillars, StemBranch, TenGod, ELEMENT_ORDER
+from xuan_dao_core import XuanDaoCore, split_dates
+
+
+# Compact chart record - sexagenary index of each pillar
+PILLAR_DTYPE = np.dtype([("year", np.uint8), ("month", np.uint8), ("day", np.uint8), ("hour", np.uint8)])
+
+
+class XuanDaoBaZi:
+    """
+    Four Pillars (八字 Ba Zi) charts of year, month, day and hour.
+
+    The year turns at Start of Spring (立春) and the months at the twelve sectional solar
+    terms (節), taken at their usual Gregorian dates (accurate to about a day). Days
+    follow the unbroken sexagenary day count and turn at the start of the Zi hour, 23:00.
+    Every pillar is an index into the sixty-pillar cycle, so whole arrays of birth
+    datetimes are charted with integer arithmetic.
+    """
+
+    def __init__(self, core: XuanDaoCore):
+        """Initialize with reference to the XuanDaoCore"""
+        self.core = core
+
+        # Gregorian day on which each month's sectional term (節) begins, by month number
+        self.term_start_days = np.array([
+            0,  # (unused)
+            6,  # 小寒 - Minor Cold, Chou month
+            4,  # 立春 - Start of Spring, Yin month and new year
+            6,  # 驚蟄 - Awakening of Insects, Mao month
+            5,  # 清明 - Clear and Bright, Chen month
+            6,  # 立夏 - Start of Summer, Si month
+            6,  # 芒種 - Grain in Ear, Wu month
+            7,  # 小暑 - Minor Heat, Wei month
+            8,  # 立秋 - Start of Autumn, Shen month
+            8,  # 白露 - White Dew, You month
+            8,  # 寒露 - Cold Dew, Xu month
+            7,  # 立冬 - Start of Winter, Hai month
+            7   # 大雪 - Major Snow, Zi month
+        ])
+
+        # 1970-01-01 was a Xin Si (辛巳) day, index 17 of the sixty-day cycle
+        self.epoch_day_index = 17
+
+        # The sixty pillars, shared by every chart
+        self.pillars: List[StemBranch] = core.sixty_jiazi_pillars
+
+        # Ten Gods: the Day Master's element relation toward a stem, split by matching polarity
+        stem_elements = self.core.stem_element_codes
+        stem_polarities = np.arange(len(self.core.heavenly_stems)) % 2
+        self.ten_god_table = (2 * self.core.relation_matrix[stem_elements[:, None], stem_elements[None, :]]
+                              + (stem_polarities[:, None] != stem_polarities[None, :])).astype(np.uint8)
+
+    def calculate_pillar_codes(self, years: Any, months: Any, days: Any,
+                               hours: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calculate the sexagenary indices of the four pillars for arrays of birth times.
+
+        Args:
+            years, months, days, hours: Integer arrays of Gregorian date and hour components
+
+        Returns:
+            tuple: (year, month, day, hour) pillar index arrays
+        """
+        years = np.asarray(years, dtype=np.int64)
+        months = np.asarray(months, dtype=np.int64)
+        days = np.asarray(days, dtype=np.int64)
+        hours = np.asarray(hours, dtype=np.int64)
+
+        # Solar month: the sectional term of this Gregorian month has begun or not
+        term_begun = days >= self.term_start_days[months]
+        month_branch = np.where(term_begun, months, months - 1) % 12
+
+        # Solar year turns at Start of Spring
+        solar_years = np.where((months > 2) | ((months == 2) & term_begun), years, years - 1)
+        year_index = (solar_years - 4) % 60
+
+        # Month stem follows the year stem (五虎遁): Jia and Ji years open with Bing Yin
+        month_number = (month_branch - 2) % 12
+        month_stem = ((year_index % 10 % 5) * 2 + 2 + month_number) % 10
+        month_index = self.core.jiazi_index(month_stem, month_branch)
+
+        # Day count, with the day turning at the Zi hour (23:00)
+        epoch_days = ((years - 1970) * 12 + months - 1).astype("datetime64[M]").astype("datetime64[D]")
+        epoch_days = epoch_days.astype(np.int64) + days - 1 + (hours >= 23)
+        day_index = (epoch_days + self.epoch_day_index) % 60
+
+        # Hour stem follows the day stem (五鼠遁): Jia and Ji days open with Jia Zi
+        hour_branch = ((hours + 1) // 2) % 12
+        hour_stem = ((day_index % 10 % 5) * 2 + hour_branch) % 10
+        hour_index = self.core.jiazi_index(hour_stem, hour_branch)
+
+        return year_index, month_index, day_index, hour_index
+
+    def day_pillar_codes(self, start_date: datetime.date, end_date: datetime.date) -> np.ndarray:
+        """Sexagenary day pillar indices of every day in an inclusive date range"""
+        dates = np.arange(np.datetime64(start_date, "D"), np.datetime64(end_date, "D") + 1)
+        return (dates.astype(np.int64) + self.epoch_day_index) % 60
+
+    def build_chart(self, birth: datetime.datetime) -> FourPillars:
+        """
+        Build the Four Pillars chart of a birth time.
+
+        Args:
+            birth: Birth date and time (local solar time)
+
+        Returns:
+            FourPillars: The chart, referencing the shared pillars
+        """
+        codes = tuple(int(code) for code in self.calculate_pillar_codes(
+            birth.year, birth.month, birth.day, getattr(birth, "hour", 0)))
+
+        return FourPillars(
+            year=self.pillars[codes[0]],
+            month=self.pillars[codes[1]],
+            day=self.pillars[codes[2]],
+            hour=self.pillars[codes[3]],
+            codes=codes
+        )
+
+    def build_charts(self, births: np.ndarray) -> np.ndarray:
+        """
+        Build Four Pillars charts for an array of birth times.
+
+        Args:
+            births: datetime64 birth times (dates without a time are taken at midnight)
+
+        Returns:
+            numpy.ndarray: Structured PILLAR_DTYPE array of pillar indices
+        """
+        births = np.asarray(births, dtype="datetime64[m]")
+        birth_days = births.astype("datetime64[D]")
+        hours = (births - birth_days).astype("timedelta64[h]").astype(np.int64)
+
+        charts = np.empty(births.shape, dtype=PILLAR_DTYPE)
+        for field, codes in zip(PILLAR_DTYPE.names, self.calculate_pillar_codes(*split_dates(birth_days), hours)):
+            charts[field] = codes
+
+        return charts
+
+    def chart_elements(self, charts: np.ndarray) -> np.ndarray:
+        """
+        Look up the stem and branch elements of every pillar of chart arrays.
+
+        Args:
+            charts: Structured PILLAR_DTYPE array
+
+        Returns:
+            numpy.ndarray: (..., 4, 2) element codes, (stem, branch) per pillar
+        """
+        codes = np.stack([charts[field] for field in PILLAR_DTYPE.names], axis=-1)
+        pillars = self.core.sixty_jiazi[codes]
+        return np.stack([pillars["stem_element"], pillars["branch_element"]], axis=-1)
+
+    def chart_element_counts(self, charts: np.ndarray, hidden_stems: bool = True,
+                             seasonal: bool = False) -> np.ndarray:
+        """
+        Count the elements of chart arrays.
+
+        Each visible stem counts once. Each branch also counts once, spread over the
+        elements of its hidden stems by weight, or given wholly to its own element when
+        hidden stems are ignored.
+
+        Args:
+            charts: Structured PILLAR_DTYPE array
+            hidden_stems: Spread branches over their hidden stems (藏干)
+            seasonal: Weight each element by its seasonal strength in the month pillar
+
+        Returns:
+            numpy.ndarray: (..., 5) element counts in element order
+        """
+        codes = np.stack([charts[field] for field in PILLAR_DTYPE.names], axis=-1).astype(np.int64)
+        flat = codes.reshape(-1, len(PILLAR_DTYPE.names))
+        n_elements = len(ELEMENT_ORDER)
+        rows = np.arange(len(flat))[:, None] * n_elements
+
+        stem_bins = rows + self.core.stem_element_codes[flat % 10]
+        if hidden_stems:
+            hidden = self.core.hidden_stem_codes[flat % 12]
+            branch_bins = rows[..., None] + self.core.stem_element_codes[hidden]
+            branch_weights = self.core.hidden_stem_weights[flat % 12]
+        else:
+            branch_bins = rows + self.core.branch_element_codes[flat % 12]
+            branch_weights = np.ones(branch_bins.shape)
+
+        counts = np.bincount(np.concatenate([stem_bins.ravel(), branch_bins.ravel()]),
+                             weights=np.concatenate([np.ones(stem_bins.size), branch_weights.ravel()]),
+                             minlength=len(flat) * n_elements)
+
+        counts = counts.reshape(codes.shape[:-1] + (n_elements,))
+        if seasonal:
+            counts = counts * self.core.seasonal_weight_table[self.month_strengths(charts)]
+
+        return counts
+
+    def month_strengths(self, charts: np.ndarray) -> np.ndarray:
+        """
+        Seasonal strength of every element in the month of each chart.
+
+        Args:
+            charts: Structured PILLAR_DTYPE array
+
+        Returns:
+            numpy.ndarray: (..., 5) SeasonalStrength codes in element order
+        """
+        return self.core.branch_seasonal_strength[charts["month"].astype(np.int64) % 12]
+
+    def pillar_strengths(self, charts: np.ndarray) -> np.ndarray:
+        """
+        Seasonal strength of the stem and branch element of every pillar.
+
+        Args:
+            charts: Structured PILLAR_DTYPE array
+
+        Returns:
+            numpy.ndarray: (..., 4, 2) SeasonalStrength codes, (stem, branch) per pillar
+        """
+        month_branches = (charts["month"].astype(np.int64) % 12)[..., None, None]
+        return self.core.branch_seasonal_strength[month_branches, self.chart_elements(charts)]
+
+    def ten_gods(self, charts: np.ndarray) -> np.ndarray:
+        """
+        Classify the stem of every pillar against the Day Master for chart arrays.
+
+        Args:
+            charts: Structured PILLAR_DTYPE array
+
+        Returns:
+            numpy.ndarray: (..., 4) uint8 TenGod codes of the year, month, day and hour
+            stems (the Day Master itself is always FRIEND)
+        """
+        codes = np.stack([charts[field] for field in PILLAR_DTYPE.names], axis=-1).astype(np.int64)
+        return self.ten_god_table[codes[..., 2:3] % 10, codes % 10]
+
+    def hidden_ten_gods(self, charts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Classify the hidden stems of every branch against the Day Master for chart arrays.
+
+        Args:
+            charts: Structured PILLAR_DTYPE array
+
+        Returns:
+            tuple: ((..., 4, 3) uint8 TenGod codes, (..., 4, 3) hidden stem weights;
+            zero weights mark padding)
+        """
+        codes = np.stack([charts[field] for field in PILLAR_DTYPE.names], axis=-1).astype(np.int64)
+        hidden = self.core.hidden_stem_codes[codes % 12]
+        gods = self.ten_god_table[(codes[..., 2:3] % 10)[..., None], hidden]
+        return gods, self.core.hidden_stem_weights[codes % 12]
+
+    def ten_god_counts(self, charts: np.ndarray, hidden_stems: bool = False) -> np.ndarray:
+        """
+        Count the Ten Gods of chart arrays, for filtering charts by Ten-God patterns.
+
+        Args:
+            charts: Structured PILLAR_DTYPE array
+            hidden_stems: Also count the main hidden stem of every branch
+
+        Returns:
+            numpy.ndarray: (..., 10) counts in TenGod order, excluding the Day Master itself
+        """
+        gods = self.ten_gods(charts)[..., [0, 1, 3]]
+        if hidden_stems:
+            gods = np.concatenate([gods, self.hidden_ten_gods(charts)[0][..., 0]], axis=-1)
+
+        flat = gods.reshape(-1, gods.shape[-1]).astype(np.int64)
+        n_gods = len(TenGod)
+        counts = np.bincount((flat + np.arange(len(flat))[:, None] * n_gods).ravel(), minlength=len(flat) * n_gods)
+
+        return counts.reshape(gods.shape[:-1] + (n_gods,))
+
+    def chart_ten_gods(self, chart: FourPillars) -> Dict[str, TenGod]:
+        """
+        Classify the stems of one chart against its Day Master.
+
+        Args:
+            chart: A FourPillars chart
+
+        Returns:
+            dict: TenGod of the year, month and hour stems
+        """
+        day_stem = chart.codes[2] % 10
+        return {field: TenGod(int(self.ten_god_table[day_stem, code % 10]))
+                for field, code in zip(PILLAR_DTYPE.names, chart.codes) if field != "day"}
+
+    def luck_directions(self, charts: np.ndarray, male: Any) -> np.ndarray:
+        """
+        Direction of the luck pillars: forward for Yang-year men and Yin-year women.
+
+        Args:
+            charts: Structured PILLAR_DTYPE array
+            male: Boolean array (or scalar) of gender, broadcast against the charts
+
+        Returns:
+            numpy.ndarray: int8 array of +1 (forward) or -1 (backward)
+        """
+        yang_year = charts["year"] % 2 == 0
+        return np.where(yang_year == np.asarray(male, dtype=bool), 1, -1).astype(np.int8)
+
+    def luck_pillars(self, charts: np.ndarray, male: Any, count: int = 8) -> np.ndarray:
+        """
+        Generate the ten-year luck pillars (大運) of chart arrays.
+
+        The luck pillars step through the sixty-pillar cycle from the month pillar,
+        one position per decade, forward or backward.
+
+        Args:
+            charts: Structured PILLAR_DTYPE array
+            male: Boolean array (or scalar) of gender, broadcast against the charts
+            count: Number of luck pillars per chart
+
+        Returns:
+            numpy.ndarray: (..., count) uint8 sexagenary indices of the luck pillars
+        """
+        steps = self.luck_directions(charts, male)[..., None].astype(np.int64) * np.arange(1, count + 1)
+        return ((charts["month"][..., None].astype(np.int64) + steps) % 60).astype(np.uint8)
+
+    def luck_start_ages(self, births: np.ndarray, male: Any) -> np.ndarray:
+        """
+        Age at which the first luck pillar begins.
+
+        The days from birth to the next sectional term (forward) or back to the previous
+        one (backward) are counted, three days to a year.
+
+        Args:
+            births: datetime64 birth times
+            male: Boolean array (or scalar) of gender, broadcast against the births
+
+        Returns:
+            numpy.ndarray: Starting ages in years
+        """
+        births = np.asarray(births, dtype="datetime64[m]")
+        directions = self.luck_directions(self.build_charts(births), male)
+
+        birth_days = births.astype("datetime64[D]")
+        month_starts = birth_days.astype("datetime64[M]")
+        months = (month_starts.astype(np.int64) % 12) + 1
+        days = (birth_days - month_starts.astype("datetime64[D]")).astype(np.int64) + 1
+
+        def term_date(offset: int) -> np.ndarray:
+            """Sectional term date of the month offset from the birth month"""
+            term_month = (months - 1 + offset) % 12 + 1
+            return (month_starts + offset).astype("datetime64[D]") + self.term_start_days[term_month] - 1
+
+        term_begun = days >= self.term_start_days[months]
+        next_term = np.where(term_begun, term_date(1), term_date(0))
+        previous_term = np.where(term_begun, term_date(0), term_date(-1))
+
+        elapsed = np.where(directions > 0, next_term - birth_days, birth_days - previous_term).astype(np.int64)
+        return elapsed / 3.0
+
+    def iter_luck_pillars(self, birth: datetime.datetime, male: bool,
+                          count: Optional[int] = None) -> Iterator[Tuple[float, StemBranch]]:
+        """
+        Lazily generate the luck pillars of one person.
+
+        Args:
+            birth: Birth date and time
+            male: Gender, setting the direction of the luck pillars
+            count: Number of luck pillars (endless if omitted)
+
+        Yields:
+            tuple: (starting age, luck pillar)
+        """
+        births = np.array([np.datetime64(birth, "m")])
+        chart = self.build_charts(births)[0]
+        direction = int(self.luck_directions(chart, male))
+        start_age = float(self.luck_start_ages(births, male)[0])
+
+        steps = itertools.count(1) if count is None else range(1, count + 1)
+        for step in steps:
+            yield start_age + 10 * (step - 1), self.pillars[(int(chart["month"]) + direction * step) % 60]
+
+    def day_relations(self, charts: np.ndarray, start_date: datetime.date, end_date: datetime.date) -> np.ndarray:
+        """
+        Flag the branch relations between chart pillars and every day of a date range.
+
+        Args:
+            charts: Structured PILLAR_DTYPE array
+            start_date, end_date: Inclusive date range
+
+        Returns:
+            numpy.ndarray: (..., days, 4) uint8 BranchRelation bitmasks of each day's branch
+            toward the year, month, day and hour branches
+        """
+        codes = np.stack([charts[field] for field in PILLAR_DTYPE.names], axis=-1).astype(np.int64)
+        day_branches = self.day_pillar_codes(start_date, end_date) % 12
+        return self.core.branch_relation_matrix[day_branches[:, None], (codes % 12)[..., None, :]]
+
+    def pillar_relations(self, charts: np.ndarray, other_charts: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Flag the branch relations between all pairs of pillars.
+
+        Args:
+            charts: Structured PILLAR_DTYPE array
+            other_charts: Charts to compare against, broadcast with charts (the charts
+                themselves if omitted)
+
+        Returns:
+            numpy.ndarray: (..., 4, 4) uint8 BranchRelation bitmasks, pillar of charts
+            toward pillar of other_charts; within one chart the diagonal only marks
+            self-punishment
+        """
+        codes = np.stack([charts[field] for field in PILLAR_DTYPE.names], axis=-1).astype(np.int64)
+        other_codes = codes if other_charts is None else np.stack(
+            [other_charts[field] for field in PILLAR_DTYPE.names], axis=-1).astype(np.int64)
+        return self.core.branch_relation_matrix[(codes % 12)[..., :, None], (other_codes % 12)[..., None, :]]
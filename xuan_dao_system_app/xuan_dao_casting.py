@@ -0,0 +1,237 @@
+# 🪙 XUÁN DÀO CASTING: READINGS THAT CAN BE CAST AGAIN 🪙
+
+import datetime
+import hashlib
+import math
+
+import numpy as np
+
+from dataclasses import dataclass
+from typing import Any, Sequence, Tuple, Union
+
+from xuan_dao_structures import HexagramCode
+from xuan_dao_core import XuanDaoCore
+
+
+# Philox4x32-10 constants (Salmon et al., "Parallel Random Numbers: As Easy as 1, 2, 3")
+PHILOX_MULTIPLIERS = (np.uint64(0xD2511F53), np.uint64(0xCD9E8D57))
+PHILOX_KEY_STEPS = (np.uint32(0x9E3779B9), np.uint32(0xBB67AE85))
+PHILOX_ROUNDS = 10
+
+
+def philox4x32(counters: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """
+    Apply the Philox4x32-10 bijection to arrays of counters under arrays of keys.
+
+    Args:
+        counters: (..., 4) uint32 counter blocks
+        keys: (..., 2) uint32 keys, broadcast against the counters
+
+    Returns:
+        numpy.ndarray: (..., 4) uint32 random words
+    """
+    counters = np.asarray(counters, dtype=np.uint32)
+    keys = np.asarray(keys, dtype=np.uint32)
+    shape = np.broadcast_shapes(counters.shape[:-1], keys.shape[:-1])
+
+    c0, c1, c2, c3 = (np.broadcast_to(counters[..., i], shape) for i in range(4))
+    k0, k1 = (np.broadcast_to(keys[..., i], shape) for i in range(2))
+    mask = np.uint64(0xFFFFFFFF)
+    shift = np.uint64(32)
+
+    # The key schedule wraps around 32 bits by design
+    with np.errstate(over="ignore"):
+        for round_idx in range(PHILOX_ROUNDS):
+            if round_idx:
+                k0 = k0 + PHILOX_KEY_STEPS[0]
+                k1 = k1 + PHILOX_KEY_STEPS[1]
+
+            product0 = PHILOX_MULTIPLIERS[0] * c0.astype(np.uint64)
+            product1 = PHILOX_MULTIPLIERS[1] * c2.astype(np.uint64)
+            hi0, lo0 = (product0 >> shift).astype(np.uint32), (product0 & mask).astype(np.uint32)
+            hi1, lo1 = (product1 >> shift).astype(np.uint32), (product1 & mask).astype(np.uint32)
+
+            c0, c1, c2, c3 = hi1 ^ c1 ^ k0, lo1, hi0 ^ c3 ^ k1, lo0
+
+    return np.stack([c0, c1, c2, c3], axis=-1)
+
+
+class XuanDaoKeyedCasting:
+    """
+    Hexagram casts derived from who asked, what and when.
+
+    A cast is a pure function of (user id, question, timestamp): the triple is hashed into
+    a Philox key, and the six line draws are Philox outputs for fixed counters under that
+    key. There is no generator state, so any worker in any process recomputes the same
+    cast, and re-deriving a batch of casts is one vectorized pass over their keys.
+    """
+
+    def __init__(self, core: XuanDaoCore, method: Union[str, Sequence[float]] = "yarrow"):
+        """
+        Initialize with reference to the XuanDaoCore.
+
+        Args:
+            core: The XuanDaoCore
+            method: Casting method name, or probabilities of line values 6, 7, 8, 9
+        """
+        self.core = core
+        self.method = method
+
+    @staticmethod
+    def question_hash(question: str) -> str:
+        """Stable digest of a question's text (whitespace-trimmed)"""
+        return hashlib.blake2b(question.strip().encode("utf-8"), digest_size=16).hexdigest()
+
+    @staticmethod
+    def cast_key(user_id: Any, question_hash: str, timestamp: Union[int, datetime.datetime]) -> Tuple[int, int]:
+        """
+        Derive the Philox key of a reading.
+
+        Args:
+            user_id: Identifier of the person asking
+            question_hash: Digest of the question (see question_hash)
+            timestamp: Time of the reading, an integer or a datetime (use an aware
+                datetime, or the same convention everywhere, for reproducibility)
+
+        Returns:
+            tuple: The two 32-bit key words
+        """
+        when = timestamp.isoformat() if isinstance(timestamp, datetime.datetime) else str(int(timestamp))
+        material = "\x1f".join([str(user_id), question_hash, when]).encode("utf-8")
+        digest = hashlib.blake2b(material, digest_size=8, person=b"xuan-dao-cast").digest()
+        return int.from_bytes(digest[:4], "little"), int.from_bytes(digest[4:], "little")
+
+    def keyed_uniforms(self, keys: np.ndarray, cast_indices: Any = 0) -> np.ndarray:
+        """
+        Derive the six line uniforms of keyed casts.
+
+        Args:
+            keys: (N, 2) uint32 cast keys
+            cast_indices: Index of the cast under each key, for repeated casts of one
+                reading (scalar or length N)
+
+        Returns:
+            numpy.ndarray: (N, 6) uniforms in (0, 1)
+        """
+        keys = np.asarray(keys, dtype=np.uint32).reshape(-1, 2)
+        counters = np.zeros((len(keys), 2, 4), dtype=np.uint32)
+        counters[:, :, 0] = np.arange(2, dtype=np.uint32)
+        counters[:, :, 1] = np.broadcast_to(np.asarray(cast_indices, dtype=np.uint32), len(keys))[:, None]
+
+        words = philox4x32(counters, keys[:, None, :]).reshape(len(keys), 8)[:, :6]
+        return (words.astype(np.float64) + 0.5) / 2.0 ** 32
+
+    def cast_keyed(self, user_id: Any, question: str, timestamp: Union[int, datetime.datetime],
+                   cast_index: int = 0) -> HexagramCode:
+        """
+        Cast (or re-cast) the hexagram of one reading.
+
+        Args:
+            user_id: Identifier of the person asking
+            question: Text of the question
+            timestamp: Time of the reading
+            cast_index: Index of the cast, for more than one cast per reading
+
+        Returns:
+            HexagramCode: The cast, identical wherever it is recomputed
+        """
+        key = np.array([self.cast_key(user_id, self.question_hash(question), timestamp)], dtype=np.uint32)
+        codes, changing = self.cast_keyed_batch(key, cast_index)
+        return HexagramCode(int(codes[0]), int(changing[0]))
+
+    def cast_keyed_batch(self, keys: np.ndarray, cast_indices: Any = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Re-derive many keyed casts in one vectorized pass.
+
+        Args:
+            keys: (N, 2) uint32 cast keys from cast_key
+            cast_indices: Index of the cast under each key (scalar or length N)
+
+        Returns:
+            tuple: (codes, changing masks) as uint8 arrays of length N
+        """
+        values = self.core.lines_from_uniforms(self.keyed_uniforms(keys, cast_indices), self.method)
+        return self.core.hexagrams_from_lines(values)
+
+
+# 📐 Casting Distribution - exact outcome probabilities of a casting method
+@dataclass
+class CastingDistribution:
+    line_probabilities: np.ndarray  # Probabilities of line values 6, 7, 8, 9
+    pair_probabilities: np.ndarray  # (64, 64) P(primary code, transformed code); rows sum to the primary marginal
+    primary: np.ndarray  # (64,) P(primary code)
+    transformed: np.ndarray  # (64,) P(transformed code)
+    changing_counts: np.ndarray  # (7,) P(number of changing lines)
+    expected_changing_lines: float  # Mean number of changing lines
+
+
+class XuanDaoCastingAnalysis:
+    """
+    Exact outcome probabilities of casting methods, without sampling.
+
+    Lines are cast independently, and each line value fixes one (primary line,
+    transformed line) pair: 6 is (yin, yang), 7 (yang, yang), 8 (yin, yin) and 9
+    (yang, yin). The 64 x 64 table of (primary, transformed) hexagram probabilities is
+    therefore the six-fold Kronecker product of that 2 x 2 line table.
+    """
+
+    def __init__(self, core: XuanDaoCore):
+        """Initialize with reference to the XuanDaoCore"""
+        self.core = core
+
+    def distribution(self, method: Union[str, Sequence[float]] = "yarrow") -> CastingDistribution:
+        """
+        Enumerate the exact outcome distribution of a casting method.
+
+        Args:
+            method: Casting method name, or probabilities of line values 6, 7, 8, 9
+
+        Returns:
+            CastingDistribution: Pair table, marginals and changing-line statistics
+        """
+        line_probabilities = self.core.casting_probabilities(method)
+        old_yin, young_yang, young_yin, old_yang = line_probabilities
+
+        # Line table indexed [primary line, transformed line]
+        line_table = np.array([[young_yin, old_yin],
+                               [old_yang, young_yang]])
+
+        # Kronecker factors run from the top line (bit 5) down to the bottom line (bit 0)
+        pair_probabilities = np.ones((1, 1))
+        for _ in range(6):
+            pair_probabilities = np.kron(pair_probabilities, line_table)
+
+        changing = old_yin + old_yang
+        lines = np.arange(7)
+        binomial = np.array([math.comb(6, k) for k in lines], dtype=np.float64)
+
+        return CastingDistribution(
+            line_probabilities=line_probabilities,
+            pair_probabilities=pair_probabilities,
+            primary=pair_probabilities.sum(axis=1),
+            transformed=pair_probabilities.sum(axis=0),
+            changing_counts=binomial * changing ** lines * (1 - changing) ** (6 - lines),
+            expected_changing_lines=6 * changing
+        )
+
+    def hexagram_odds(self, distribution: CastingDistribution) -> np.ndarray:
+        """
+        Odds of casting each hexagram, in King Wen order.
+
+        Args:
+            distribution: A casting distribution
+
+        Returns:
+            numpy.ndarray: (64, 3) rows of (probability as primary, probability as
+            transformed, probability of appearing unchanged), row i for King Wen number i + 1
+        """
+        codes = self.core.hexagram_codes[1:]
+        unchanged = np.diagonal(distribution.pair_probabilities)
+        return np.stack([distribution.primary[codes], distribution.transformed[codes], unchanged[codes]], axis=-1)
+
+    def pair_probability(self, distribution: CastingDistribution, primary_number: Any,
+                         transformed_number: Any) -> np.ndarray:
+        """Probability of casting a primary hexagram that changes into a transformed one, by King Wen number"""
+        primary = self.core.hexagram_codes[np.asarray(primary_number)]
+        transformed = self.core.hexagram_codes[np.asarray(transformed_number)]
+        return distribution.pair_probabilities[primary, transformed]
@@ -0,0 +1,140 @@
+# 💞 XUÁN DÀO COMPATIBILITY: THE RESONANCE BETWEEN TWO PATTERNS 💞
+
+import numpy as np
+
+from typing import Dict, Optional, Tuple, Union
+
+from xuan_dao_structures import ElementBalance, ElementRelation, ELEMENT_ORDER
+from xuan_dao_core import XuanDaoCore
+
+
+class XuanDaoCompatibility:
+    """
+    Compatibility between element balances through the generation and control cycles.
+
+    Each balance is reduced to its share of every element. The compatibility of two
+    balances is the bilinear form a·W·b, where W[i, j] weighs how element i of the first
+    relates to element j of the second: generation nourishes, control restrains. Scoring
+    N balances against M is therefore a matrix product, computed in blocks with a running
+    top-k so the full N x M score matrix is never held in memory.
+    """
+
+    def __init__(self, core: XuanDaoCore,
+                 relation_weights: Optional[Dict[Union[ElementRelation, str], float]] = None):
+        """
+        Initialize with reference to the XuanDaoCore.
+
+        Args:
+            core: The XuanDaoCore
+            relation_weights: Weight of each ElementRelation, or of its name ("same", "generates",
+                "generated_by", "controls", "controlled_by"); unspecified relations keep their defaults
+        """
+        self.core = core
+
+        self.relation_weights = {
+            ElementRelation.SAME: 0.5,  # Shared element - resonance
+            ElementRelation.GENERATES: 1.0,  # Nourishing the other
+            ElementRelation.GENERATED_BY: 1.0,  # Being nourished by the other
+            ElementRelation.CONTROLS: -1.0,  # Restraining the other
+            ElementRelation.CONTROLLED_BY: -1.0  # Being restrained by the other
+        }
+        if relation_weights:
+            self.relation_weights.update({
+                ElementRelation[relation.upper()] if isinstance(relation, str) else ElementRelation(relation): weight
+                for relation, weight in relation_weights.items()
+            })
+
+        # Weight matrix of element i (first balance) against element j (second balance)
+        relation_weights = np.array([self.relation_weights[relation] for relation in ElementRelation], dtype=np.float32)
+        self.weights = relation_weights[core.relation_matrix]
+
+    def compatibility(self, balance_a: ElementBalance, balance_b: ElementBalance) -> float:
+        """
+        Calculate the compatibility of two element balances.
+
+        Args:
+            balance_a, balance_b: Element balances to compare
+
+        Returns:
+            float: Compatibility score between -1 and 1
+        """
+        counts_a = [[balance_a.element_counts[element] for element in ELEMENT_ORDER]]
+        counts_b = [[balance_b.element_counts[element] for element in ELEMENT_ORDER]]
+        return float(self.score_matrix(counts_a, counts_b)[0, 0])
+
+    def score_matrix(self, counts_a: np.ndarray, counts_b: np.ndarray) -> np.ndarray:
+        """
+        Score every row of one count matrix against every row of another.
+
+        Args:
+            counts_a: (N, 5) element counts
+            counts_b: (M, 5) element counts
+
+        Returns:
+            numpy.ndarray: (N, M) compatibility scores
+        """
+        return (self._element_shares(counts_a) @ self.weights) @ self._element_shares(counts_b).T
+
+    def top_k(self, queries: np.ndarray, candidates: np.ndarray, k: int = 20,
+              query_block: int = 2048, candidate_block: int = 65536,
+              exclude_self: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k most compatible candidates for every query.
+
+        Scores are computed one query block x candidate block tile at a time and merged
+        into a running top-k per query with argpartition, so memory is bounded by the
+        block sizes rather than N x M. Ties at the k-th score are broken arbitrarily.
+
+        Args:
+            queries: (N, 5) element counts
+            candidates: (M, 5) element counts
+            k: Number of matches per query
+            query_block, candidate_block: Tile dimensions
+            exclude_self: Skip candidate i for query i (queries and candidates are the same set)
+
+        Returns:
+            tuple: (scores, indices), both (N, k), best match first
+        """
+        weighted_queries = self._element_shares(queries) @ self.weights
+        candidate_shares = self._element_shares(candidates)
+        n_queries, n_candidates = len(weighted_queries), len(candidate_shares)
+        k = min(k, n_candidates)
+
+        best_scores = np.empty((n_queries, k), dtype=np.float32)
+        best_indices = np.empty((n_queries, k), dtype=np.int64)
+
+        for q_start in range(0, n_queries, query_block):
+            q_stop = min(q_start + query_block, n_queries)
+            block = weighted_queries[q_start:q_stop]
+
+            top_scores = np.full((len(block), k), -np.inf, dtype=np.float32)
+            top_indices = np.full((len(block), k), -1, dtype=np.int64)
+
+            for c_start in range(0, n_candidates, candidate_block):
+                c_stop = min(c_start + candidate_block, n_candidates)
+                scores = block @ candidate_shares[c_start:c_stop].T
+
+                if exclude_self:
+                    rows = np.arange(max(q_start, c_start), min(q_stop, c_stop))
+                    scores[rows - q_start, rows - c_start] = -np.inf
+
+                # Merge the tile into the running top-k; positions past k index into the tile
+                merged = np.concatenate([top_scores, scores], axis=1)
+                positions = np.argpartition(merged, -k, axis=1)[:, -k:]
+                top_scores = np.take_along_axis(merged, positions, axis=1)
+                top_indices = np.where(positions < k,
+                                       np.take_along_axis(top_indices, np.minimum(positions, k - 1), axis=1),
+                                       c_start + positions - k)
+
+            order = np.lexsort((top_indices, -top_scores), axis=1)
+            best_scores[q_start:q_stop] = np.take_along_axis(top_scores, order, axis=1)
+            best_indices[q_start:q_stop] = np.take_along_axis(top_indices, order, axis=1)
+
+        return best_scores, best_indices
+
+    @staticmethod
+    def _element_shares(counts: np.ndarray) -> np.ndarray:
+        """Normalize count rows to element shares summing to one"""
+        counts = np.asarray(counts, dtype=np.float32).reshape(-1, len(ELEMENT_ORDER))
+        totals = counts.sum(axis=1, keepdims=True)
+        return np.divide(counts, totals, out=np.zeros_like(counts), where=totals > 0)
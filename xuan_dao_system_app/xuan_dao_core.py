@@ -4,11 +4,40 @@ import numpy as np
 import datetime
 import random
 
-from typing import Dict, List, Tuple, Optional, Any, Union
+from typing import Dict, List, Tuple, Optional, Any, Sequence, Union
 
-from xuan_dao_structures import Element, DayEnergy, ElementBalance, Hexagram, StemBranch, Polarity, \
-    initialize_five_elements, initialize_stems_branches, initialize_flying_stars, initialize_trigrams, \
-    initialize_palaces
+from xuan_dao_structures import Element, DayEnergy, ElementBalance, ElementRelation, Hexagram, HexagramCode, \
+    StemBranch, Polarity, SeasonalStrength, ELEMENT_ORDER, ELEMENT_CODES, initialize_five_elements, \
+    initialize_stems_branches, initialize_flying_stars, initialize_trigrams, initialize_palaces, \
+    initialize_hidden_stems, initialize_branch_relations, initialize_na_yin, initialize_hexagrams, \
+    initialize_casting_methods
+
+
+def split_dates(dates: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Split an array of dates into year, month and day component arrays.
+
+    Args:
+        dates: datetime64 array, or integer array of shape (N, 3) holding year, month, day
+
+    Returns:
+        tuple: (years, months, days) as int64 arrays
+    """
+    dates = np.asarray(dates)
+
+    if np.issubdtype(dates.dtype, np.datetime64):
+        dates = dates.astype("datetime64[D]")
+        month_starts = dates.astype("datetime64[M]")
+        years = dates.astype("datetime64[Y]").astype(np.int64) + 1970
+        months = month_starts.astype(np.int64) % 12 + 1
+        days = (dates - month_starts).astype(np.int64) + 1
+        return years, months, days
+
+    if dates.ndim != 2 or dates.shape[1] != 3:
+        raise ValueError(f"Expected datetime64 dates or an (N, 3) year/month/day array, got shape {dates.shape}")
+
+    dates = dates.astype(np.int64)
+    return dates[:, 0], dates[:, 1], dates[:, 2]
 
 
 class XuanDaoCore:
@@ -31,6 +60,30 @@ class XuanDaoCore:
 
         # Initialize the Celestial Calendar system
         self.heavenly_stems, self.earthly_branches, self.stem_element_map, self.branch_element_map = initialize_stems_branches()
+        self.stem_element_codes = np.array([ELEMENT_CODES[self.stem_element_map[stem]]
+                                            for stem in self.heavenly_stems], dtype=np.int8)
+        self.branch_element_codes = np.array([ELEMENT_CODES[self.branch_element_map[branch]]
+                                              for branch in self.earthly_branches], dtype=np.int8)
+
+        # Hidden stems of each branch, padded to three with zero-weight entries
+        self.hidden_stems = initialize_hidden_stems()
+        self.hidden_stem_codes = np.zeros((len(self.earthly_branches), 3), dtype=np.int8)
+        self.hidden_stem_weights = np.zeros((len(self.earthly_branches), 3))
+        for branch_idx, branch in enumerate(self.earthly_branches):
+            for slot, (stem, weight) in enumerate(self.hidden_stems[branch]):
+                self.hidden_stem_codes[branch_idx, slot] = self.heavenly_stems.index(stem)
+                self.hidden_stem_weights[branch_idx, slot] = weight
+
+        # Branch relation bitmasks: every pair of branches within a group carries the group's flag
+        self.branch_relations = initialize_branch_relations()
+        self.branch_relation_matrix = np.zeros((len(self.earthly_branches), len(self.earthly_branches)), dtype=np.uint8)
+        for relation, groups in self.branch_relations.items():
+            for group in groups:
+                members = [self.earthly_branches.index(branch) for branch in group]
+                for a in members:
+                    for b in members:
+                        if a != b or len(members) == 1:
+                            self.branch_relation_matrix[a, b] |= relation
 
         # Create the Lo Shu magic square - foundation of space-time calculation
         self.lo_shu = np.array([
@@ -55,14 +108,43 @@ class XuanDaoCore:
             "立冬", "小雪", "大雪", "冬至", "小寒", "大寒"
         ]
 
+        # Generate the Element interaction network - the web of creation
+        self.element_network = self._generate_element_network()
+
+        # Encode the network as a matrix of relation codes between element codes
+        self.relation_matrix = self._generate_relation_matrix()
+        self.generates_codes = np.argmax(self.relation_matrix == ElementRelation.GENERATES, axis=1).astype(np.int8)
+        self.generated_by_codes = np.argmax(self.relation_matrix == ElementRelation.GENERATED_BY, axis=1).astype(np.int8)
+        self.controls_codes = np.argmax(self.relation_matrix == ElementRelation.CONTROLS, axis=1).astype(np.int8)
+
+        # The generating or controlling element of a stem-branch pair dominates, the stem otherwise
+        branch_dominates = np.isin(self.relation_matrix, [ElementRelation.GENERATED_BY, ElementRelation.CONTROLLED_BY])
+        element_codes = np.arange(len(ELEMENT_ORDER))
+        self.dominant_matrix = np.where(branch_dominates, element_codes[None, :], element_codes[:, None]).astype(np.int8)
+
+        # Precompute the attributes of the sixty stem-branch pillars
+        self._initialize_sixty_jiazi()
+
         # Set the current cosmic time
         self.update_cosmic_time()
 
-        # Generate the Element interaction network - the web of creation
-        self.element_network = self._generate_element_network()
+        # Precompute every element balance - sixty years, twelve months, ten day stems
+        self._initialize_element_balance_table()
+
+        # Precompute the strength of each element in each month
+        self._initialize_seasonal_strength_table()
+
+        # Precompute the energy of each of the sixty day codes
+        self._initialize_day_energy_table()
 
-        # Initialize the Hexagram database (simplified - just a few examples)
-        self.hexagrams = self._initialize_basic_hexagrams()
+        # Initialize the Hexagram database - all sixty-four in the King Wen sequence
+        self.hexagrams = initialize_hexagrams(self.trigrams)
+        self._initialize_hexagram_tables()
+
+        # Line distributions of the casting methods, as alias tables
+        self.casting_methods = initialize_casting_methods()
+        self.casting_alias_tables = {name: self.build_alias_table(probabilities)
+                                     for name, probabilities in self.casting_methods.items()}
 
     def update_cosmic_time(self):
         """Synchronize with current cosmic patterns through time calculation"""
@@ -85,80 +167,117 @@ class XuanDaoCore:
         Returns:
             StemBranch: The calculated stem-branch date
         """
-        # Calculate the stem and branch for the year
-        stem_idx = (year - 4) % 10
-        branch_idx = (year - 4) % 12
-
-        year_stem = self.heavenly_stems[stem_idx]
-        year_branch = self.earthly_branches[branch_idx]
-        year_stem_element = self.stem_element_map[year_stem]
-        year_branch_element = self.branch_element_map[year_branch]
+        # The year is a position in the sixty-pillar cycle
+        year_pillar = self.sixty_jiazi_pillars[(year - 4) % 60]
 
         # Calculate the stem and branch for the month
         month_offset = (month + 2) % 12
         if month_offset == 0:
             month_offset = 12
 
-        month_stem_idx = (year * 12 + month - 14) % 10
-        month_stem = self.heavenly_stems[month_stem_idx]
+        month_stem = self.heavenly_stems[(year * 12 + month - 14) % 10]
         month_branch = self.earthly_branches[month_offset - 1]
-        month_stem_element = self.stem_element_map[month_stem]
-        month_branch_element = self.branch_element_map[month_branch]
 
-        # Calculate the stem and branch for the day
+        # Calculate the day's position in the sixty-pillar cycle
         # This is a simplified calculation
         total_days = (year - 1900) * 365 + month * 30 + day
-        day_stem_idx = total_days % 10
-        day_branch_idx = total_days % 12
-
-        day_stem = self.heavenly_stems[day_stem_idx]
-        day_branch = self.earthly_branches[day_branch_idx]
-        day_stem_element = self.stem_element_map[day_stem]
-        day_branch_element = self.branch_element_map[day_branch]
+        day_pillar = self.sixty_jiazi_pillars[total_days % 60]
 
         # Store current date components
-        self.current_year_stem = year_stem
-        self.current_year_branch = year_branch
-        self.current_year_element = year_stem_element
+        self.current_year_stem = year_pillar.stem
+        self.current_year_branch = year_pillar.branch
+        self.current_year_element = year_pillar.stem_element
 
         self.current_month_stem = month_stem
         self.current_month_branch = month_branch
-        self.current_month_element = month_stem_element
-
-        self.current_day_stem = day_stem
-        self.current_day_branch = day_branch
-        self.current_day_element = day_stem_element
-
-        # Return the day's stem-branch calculation
-        return StemBranch(
-            stem=day_stem,
-            branch=day_branch,
-            stem_element=day_stem_element,
-            branch_element=day_branch_element,
-            stem_polarity=Polarity.YANG if day_stem_idx % 2 == 0 else Polarity.YIN,
-            combined_element=self._determine_dominant_element(day_stem_element, day_branch_element)
-        )
+        self.current_month_element = self.stem_element_map[month_stem]
+
+        self.current_day_stem = day_pillar.stem
+        self.current_day_branch = day_pillar.branch
+        self.current_day_element = day_pillar.stem_element
+
+        # Return the day's stem-branch pillar
+        return day_pillar
+
+    def _initialize_sixty_jiazi(self):
+        """
+        Precompute the sixty stem-branch pillars (六十甲子) as one structured table.
+
+        Every pillar is a uint8 index into the table; attribute arrays of many pillars are
+        read by fancy indexing, e.g. ``self.sixty_jiazi["na_yin_element"][indices]``.
+        """
+        self.na_yin = initialize_na_yin()
+
+        cycle = np.arange(60)
+        stem_codes = self.stem_element_codes[cycle % 10]
+        branch_codes = self.branch_element_codes[cycle % 12]
+        na_yin_codes = np.array([ELEMENT_CODES[element] for _, element in self.na_yin])
+
+        self.sixty_jiazi = np.zeros(60, dtype=[
+            ("stem", np.uint8), ("branch", np.uint8),
+            ("stem_element", np.uint8), ("branch_element", np.uint8), ("combined_element", np.uint8),
+            ("polarity", np.uint8),  # 0 = Yang, 1 = Yin
+            ("na_yin", np.uint8),  # Index into self.na_yin
+            ("na_yin_element", np.uint8)
+        ])
+        self.sixty_jiazi["stem"] = cycle % 10
+        self.sixty_jiazi["branch"] = cycle % 12
+        self.sixty_jiazi["stem_element"] = stem_codes
+        self.sixty_jiazi["branch_element"] = branch_codes
+        self.sixty_jiazi["combined_element"] = self.dominant_matrix[stem_codes, branch_codes]
+        self.sixty_jiazi["polarity"] = cycle % 2
+        self.sixty_jiazi["na_yin"] = cycle // 2
+        self.sixty_jiazi["na_yin_element"] = na_yin_codes[cycle // 2]
+
+        self.sixty_jiazi_names = [self.heavenly_stems[stem] + self.earthly_branches[branch]
+                                  for stem, branch in zip(self.sixty_jiazi["stem"], self.sixty_jiazi["branch"])]
+
+        # One shared StemBranch per pillar
+        self.sixty_jiazi_pillars = [
+            StemBranch(
+                stem=self.heavenly_stems[row["stem"]],
+                branch=self.earthly_branches[row["branch"]],
+                stem_element=ELEMENT_ORDER[row["stem_element"]],
+                branch_element=ELEMENT_ORDER[row["branch_element"]],
+                stem_polarity=Polarity.YANG if row["polarity"] == 0 else Polarity.YIN,
+                combined_element=ELEMENT_ORDER[row["combined_element"]]
+            )
+            for row in self.sixty_jiazi
+        ]
+
+    @staticmethod
+    def jiazi_index(stems: Any, branches: Any) -> Any:
+        """Position in the sixty-pillar cycle of stem and branch indices of equal parity"""
+        return (6 * np.asarray(stems) - 5 * np.asarray(branches)) % 60
+
+    def jiazi_attributes(self, indices: Any, field: str) -> np.ndarray:
+        """
+        Read one attribute of many pillars.
+
+        Args:
+            indices: Sixty-pillar cycle indices (any integer array)
+            field: Field of the sixty_jiazi table, e.g. "stem_element" or "na_yin_element"
+
+        Returns:
+            numpy.ndarray: The attribute of each pillar
+        """
+        return self.sixty_jiazi[field][np.asarray(indices, dtype=np.intp)]
 
     def _determine_dominant_element(self, stem_element: Element, branch_element: Element) -> Element:
         """Determine the dominant element from stem and branch elements"""
-        # If the elements are the same, that's the dominant element
-        if stem_element == branch_element:
-            return stem_element
+        return ELEMENT_ORDER[self.dominant_matrix[ELEMENT_CODES[stem_element], ELEMENT_CODES[branch_element]]]
 
-        # If one element generates the other, the generating element is dominant
-        if self.elements[stem_element].generates == branch_element:
-            return stem_element
-        if self.elements[branch_element].generates == stem_element:
-            return branch_element
+    def relation(self, a_codes: Any, b_codes: Any) -> np.ndarray:
+        """
+        Look up the relation of elements toward other elements.
 
-        # If one element controls the other, the controlling element is dominant
-        if self.elements[stem_element].controlled_by == branch_element:
-            return branch_element
-        if self.elements[branch_element].controlled_by == stem_element:
-            return stem_element
+        Args:
+            a_codes, b_codes: Element codes (scalars or broadcastable arrays)
 
-        # Default to the stem element if no clear relationship
-        return stem_element
+        Returns:
+            numpy.ndarray: ElementRelation codes of each a toward each b
+        """
+        return self.relation_matrix[np.asarray(a_codes), np.asarray(b_codes)]
 
     def _calculate_flying_star_period(self, year: int) -> int:
         """Calculate the current flying star period based on year"""
@@ -201,43 +320,58 @@ class XuanDaoCore:
 
         return network
 
-    def _initialize_basic_hexagrams(self) -> Dict[int, Hexagram]:
-        """Initialize a few key hexagrams for demonstration"""
-        hexagrams = {}
-
-        # Hexagram 1: Qian (The Creative)
-        upper_trigram = self.trigrams["乾"]
-        lower_trigram = self.trigrams["乾"]
-        hexagrams[1] = Hexagram(
-            upper_trigram=upper_trigram,
-            lower_trigram=lower_trigram,
-            number=1,
-            chinese_name="乾為天",
-            english_name="The Creative",
-            description="Pure yang energy, heaven, creative force",
-            judgment="The Creative works sublime success, furthering through perseverance.",
-            image="The movement of heaven is power. Thus the superior person makes himself strong and untiring.",
-            changing_lines=[]
-        )
+    def _generate_relation_matrix(self) -> np.ndarray:
+        """Generate the 5x5 matrix of ElementRelation codes, row element toward column element"""
+        matrix = np.zeros((len(ELEMENT_ORDER), len(ELEMENT_ORDER)), dtype=np.int8)
 
-        # Hexagram 2: Kun (The Receptive)
-        upper_trigram = self.trigrams["坤"]
-        lower_trigram = self.trigrams["坤"]
-        hexagrams[2] = Hexagram(
-            upper_trigram=upper_trigram,
-            lower_trigram=lower_trigram,
-            number=2,
-            chinese_name="坤為地",
-            english_name="The Receptive",
-            description="Pure yin energy, earth, receptive force",
-            judgment="The Receptive brings about sublime success, furthering through the perseverance of a mare.",
-            image="The earth's condition is receptive devotion. Thus the superior person who has breadth of character carries the outer world.",
-            changing_lines=[]
-        )
+        for element in ELEMENT_ORDER:
+            matrix[ELEMENT_CODES[element], ELEMENT_CODES[element]] = ElementRelation.SAME
+            for relation, related in self.element_network[element].items():
+                matrix[ELEMENT_CODES[element], ELEMENT_CODES[related]] = ElementRelation[relation.upper()]
 
-        # Add more hexagrams as needed
+        return matrix
 
-        return hexagrams
+    def _initialize_hexagram_tables(self):
+        """
+        Index trigrams and hexagrams by their line codes.
+
+        A trigram code holds its three lines as bits (bottom line first) and a hexagram
+        code is its lower trigram code plus eight times its upper trigram code, so every
+        lookup is a single array index, for one code or a whole array of them.
+        """
+        self.trigram_codes = {name: sum(line << i for i, line in enumerate(trigram.lines))
+                              for name, trigram in self.trigrams.items()}
+        self.trigrams_by_code = [""] * 8
+        for name, code in self.trigram_codes.items():
+            self.trigrams_by_code[code] = name
+        self.trigram_element_codes = np.array([ELEMENT_CODES[self.trigrams[name].element]
+                                               for name in self.trigrams_by_code], dtype=np.int8)
+
+        # Binary code to King Wen number and record, and King Wen number back to code
+        self.king_wen_numbers = np.zeros(64, dtype=np.uint8)
+        self.hexagram_codes = np.zeros(65, dtype=np.uint8)
+        self.hexagrams_by_code: List[Optional[Hexagram]] = [None] * 64
+        for number, hexagram in self.hexagrams.items():
+            code = self.trigram_codes[hexagram.lower_trigram.name] | (self.trigram_codes[hexagram.upper_trigram.name] << 3)
+            self.king_wen_numbers[code] = number
+            self.hexagram_codes[number] = code
+            self.hexagrams_by_code[code] = hexagram
+
+        # Related hexagrams by code
+        codes = np.arange(64, dtype=np.uint8)
+        bits = self.codes_to_lines(codes)
+
+        # Changing transitions: the hexagram a code becomes under each changing-line mask
+        self.changing_transitions = codes[:, None] ^ codes[None, :]
+
+        # 互卦 Nuclear: lines 2-4 form the lower trigram, lines 3-5 the upper
+        self.nuclear_codes = (((codes >> 1) & 0b111) | (((codes >> 2) & 0b111) << 3)).astype(np.uint8)
+
+        # 綜卦 Inverse: the hexagram turned upside down
+        self.inverse_codes = self.lines_to_codes(bits[:, ::-1])
+
+        # 錯卦 Complement: every line changed
+        self.complement_codes = codes ^ np.uint8(0b111111)
 
     def generate_hexagram(self) -> Tuple[List[int], int, List[int]]:
         """
@@ -246,8 +380,18 @@ class XuanDaoCore:
         Returns:
             tuple: (lines, hexagram_number, changing_lines)
         """
-        lines = []
-        changing_lines = []
+        cast = self.generate_hexagram_code()
+        return cast.lines, self._calculate_hexagram_number(cast), cast.changing_lines
+
+    def generate_hexagram_code(self) -> HexagramCode:
+        """
+        Generate a hexagram using the traditional coin method.
+
+        Returns:
+            HexagramCode: The cast lines and changing lines
+        """
+        code = 0
+        changing = 0
 
         for i in range(6):
             # Simulate three coin tosses
@@ -255,63 +399,243 @@ class XuanDaoCore:
             coins = [random.choice([2, 3]) for _ in range(3)]
             coin_sum = sum(coins)
 
-            # Determine line type and changing status
-            if coin_sum == 6:  # All tails (2+2+2) = 6 = old yin (changing to yang)
-                lines.append(0)  # Yin line
-                changing_lines.append(i)  # Mark as changing
-            elif coin_sum == 7:  # Two tails, one head (2+2+3) = 7 = young yang (stable)
-                lines.append(1)  # Yang line
-            elif coin_sum == 8:  # One tail, two heads (2+3+3) = 8 = young yin (stable)
-                lines.append(0)  # Yin line
-            elif coin_sum == 9:  # All heads (3+3+3) = 9 = old yang (changing to yin)
-                lines.append(1)  # Yang line
-                changing_lines.append(i)  # Mark as changing
-
-        # Calculate hexagram number (simplified)
-        hexagram_number = self._calculate_hexagram_number(lines)
-
-        return lines, hexagram_number, changing_lines
-
-    def _calculate_hexagram_number(self, lines: List[int]) -> int:
-        """Calculate the hexagram number (simplified)"""
-        # This is a simplified calculation that doesn't match the actual I Ching sequence
-        # In a complete implementation, this would map to the King Wen sequence
-        binary_value = 0
-        for i, line in enumerate(lines):
-            binary_value += line * (2 ** i)
-
-        # For simplicity, return the binary value + 1 (to avoid hexagram 0)
-        # Real implementation would map this to the proper King Wen sequence
-        return binary_value + 1
-
-    def analyze_hexagram(self, lines: List[int]) -> Tuple[str, str, Optional[Hexagram]]:
+            # 6 = old yin (changing), 7 = young yang, 8 = young yin, 9 = old yang (changing)
+            if coin_sum in (7, 9):
+                code |= 1 << i
+            if coin_sum in (6, 9):
+                changing |= 1 << i
+
+        return HexagramCode(code, changing)
+
+    @staticmethod
+    def generate_hexagrams(n: int, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Analyze a hexagram into its component trigrams.
+        Cast many hexagrams by the three-coin method in one vectorized draw.
+
+        Each line is three fair coins: it is Yang when an odd number land heads, and
+        changing when all three agree. Taking the three coins of all six lines as three
+        6-bit words, the code is their XOR and the changing mask is where all three
+        agree. One 64-bit raw draw supplies the 18 coins of three casts.
 
         Args:
-            lines: Six-line hexagram pattern
+            n: Number of hexagrams to cast
+            rng: NumPy Generator (or seed) to draw from (fresh entropy if omitted)
 
         Returns:
-            tuple: (lower_trigram_name, upper_trigram_name, hexagram_obj)
+            tuple: (codes, changing masks) as uint8 arrays of length n
+        """
+        rng = np.random.default_rng(rng)
+        raw = rng.bit_generator.random_raw(-(-n // 3))
+
+        coins = np.stack([raw, raw >> np.uint64(18), raw >> np.uint64(36)], axis=-1).ravel()[:n]
+        first = (coins & np.uint64(0o77)).astype(np.uint8)
+        second = ((coins >> np.uint64(6)) & np.uint64(0o77)).astype(np.uint8)
+        third = ((coins >> np.uint64(12)) & np.uint64(0o77)).astype(np.uint8)
+
+        codes = first ^ second ^ third
+        changing = ~((first ^ second) | (second ^ third)) & np.uint8(0o77)
+        return codes, changing
+
+    @staticmethod
+    def build_alias_table(probabilities: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Build a Walker/Vose alias table for a discrete distribution.
+
+        Args:
+            probabilities: Probability of each outcome (normalized here)
+
+        Returns:
+            tuple: (acceptance thresholds, alias outcomes), one column per outcome
+        """
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        if probabilities.ndim != 1 or np.any(probabilities < 0) or probabilities.sum() <= 0:
+            raise ValueError("Probabilities must be a non-negative vector with a positive sum")
+
+        k = len(probabilities)
+        scaled = probabilities * k / probabilities.sum()
+        thresholds = np.ones(k)
+        aliases = np.arange(k, dtype=np.uint8)
+
+        small = [i for i in range(k) if scaled[i] < 1.0]
+        large = [i for i in range(k) if scaled[i] >= 1.0]
+        while small and large:
+            lesser, greater = small.pop(), large.pop()
+            thresholds[lesser] = scaled[lesser]
+            aliases[lesser] = greater
+            scaled[greater] -= 1.0 - scaled[lesser]
+            (small if scaled[greater] < 1.0 else large).append(greater)
+
+        return thresholds, aliases
+
+    def casting_probabilities(self, method: Union[str, Sequence[float]]) -> np.ndarray:
+        """
+        Resolve a casting method into normalized probabilities of line values 6, 7, 8, 9.
+
+        Args:
+            method: Casting method name, or probabilities (weights) of line values 6, 7, 8, 9
+
+        Returns:
+            numpy.ndarray: The four line probabilities, summing to one
+        """
+        if isinstance(method, str):
+            if method not in self.casting_methods:
+                raise ValueError(f"Unknown casting method: {method}")
+            method = self.casting_methods[method]
+
+        probabilities = np.asarray(method, dtype=np.float64)
+        if probabilities.shape != (4,) or not np.all(np.isfinite(probabilities)) \
+                or np.any(probabilities < 0) or probabilities.sum() <= 0:
+            raise ValueError("A casting method needs four finite, non-negative probabilities of "
+                             f"line values 6, 7, 8, 9 with a positive sum, got {method}")
+        return probabilities / probabilities.sum()
+
+    def _casting_alias_table(self, method: Union[str, Sequence[float]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Alias table of a named casting method, or of explicit line probabilities"""
+        if isinstance(method, str):
+            if method not in self.casting_alias_tables:
+                raise ValueError(f"Unknown casting method: {method}")
+            return self.casting_alias_tables[method]
+        return self.build_alias_table(self.casting_probabilities(method))
+
+    def cast_lines(self, shape: Any, method: Union[str, Sequence[float]] = "yarrow",
+                   rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Cast line values with one uniform draw and one table lookup per line.
+
+        Args:
+            shape: Shape of the array of lines
+            method: Casting method name, or probabilities of line values 6, 7, 8, 9
+            rng: NumPy Generator (or seed) to draw from (fresh entropy if omitted)
+
+        Returns:
+            numpy.ndarray: uint8 line values 6 (old yin), 7 (young yang), 8 (young yin)
+            or 9 (old yang)
+        """
+        return self.lines_from_uniforms(np.random.default_rng(rng).random(shape), method)
+
+    def lines_from_uniforms(self, uniforms: np.ndarray, method: Union[str, Sequence[float]] = "yarrow") -> np.ndarray:
+        """
+        Turn uniform draws in [0, 1) into line values through the method's alias table.
+
+        Args:
+            uniforms: Array of uniform draws, one per line
+            method: Casting method name, or probabilities of line values 6, 7, 8, 9
+
+        Returns:
+            numpy.ndarray: uint8 line values 6-9
+        """
+        thresholds, aliases = self._casting_alias_table(method)
+        scaled = np.asarray(uniforms, dtype=np.float64) * len(thresholds)
+
+        columns = scaled.astype(np.intp)
+        outcomes = np.where(scaled - columns < thresholds[columns], columns, aliases[columns])
+        return (outcomes + 6).astype(np.uint8)
+
+    def hexagrams_from_lines(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pack (..., 6) arrays of line values 6-9 into hexagram codes and changing masks.
+
+        Returns:
+            tuple: (codes, changing masks) as uint8 arrays
+        """
+        values = np.asarray(values, dtype=np.uint8)
+
+        # 7 and 9 are Yang, 6 and 9 are changing
+        return self.lines_to_codes(values & 1), self.lines_to_codes((values == 6) | (values == 9))
+
+    def cast_hexagrams(self, n: int, method: Union[str, Sequence[float]] = "yarrow",
+                       rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Cast many hexagrams with any line distribution.
+
+        Args:
+            n: Number of hexagrams to cast
+            method: Casting method name ("coins", "yarrow"), or probabilities of line
+                values 6, 7, 8, 9
+            rng: NumPy Generator (or seed) to draw from (fresh entropy if omitted)
+
+        Returns:
+            tuple: (codes, changing masks) as uint8 arrays of length n
+        """
+        return self.hexagrams_from_lines(self.cast_lines((n, 6), method, rng))
+
+    def cast_hexagram(self, method: Union[str, Sequence[float]] = "yarrow",
+                      rng: Optional[np.random.Generator] = None) -> HexagramCode:
+        """
+        Cast one hexagram with any line distribution.
+
+        Args:
+            method: Casting method name ("coins", "yarrow"), or probabilities of line
+                values 6, 7, 8, 9
+            rng: NumPy Generator (or seed) to draw from (fresh entropy if omitted)
+
+        Returns:
+            HexagramCode: The cast lines and changing lines
+        """
+        codes, changing = self.cast_hexagrams(1, method, rng)
+        return HexagramCode(int(codes[0]), int(changing[0]))
+
+    @staticmethod
+    def _hexagram_code(hexagram: Union[HexagramCode, List[int]],
+                       changing_lines: Optional[List[int]] = None) -> HexagramCode:
+        """Accept a HexagramCode, or six lines, with optional changing line indices overriding the code's"""
+        if isinstance(hexagram, HexagramCode):
+            if changing_lines is None:
+                return hexagram
+            hexagram = hexagram.lines
+        return HexagramCode.from_lines(hexagram, changing_lines)
+
+    @staticmethod
+    def lines_to_codes(lines: np.ndarray) -> np.ndarray:
+        """
+        Pack arrays of six lines into hexagram codes.
+
+        Args:
+            lines: (..., 6) array of 0/1 lines (or changing flags), bottom to top
+
+        Returns:
+            numpy.ndarray: (...) uint8 codes, line i in bit i
+        """
+        return (np.asarray(lines, dtype=np.uint8) << np.arange(6, dtype=np.uint8)).sum(axis=-1, dtype=np.uint8)
+
+    @staticmethod
+    def codes_to_lines(codes: np.ndarray) -> np.ndarray:
+        """
+        Unpack hexagram codes into arrays of six lines.
+
+        Args:
+            codes: uint8 hexagram codes (or changing masks)
+
+        Returns:
+            numpy.ndarray: (..., 6) uint8 lines, bottom to top
         """
-        lower_lines = tuple(lines[0:3])
-        upper_lines = tuple(lines[3:6])
+        return (np.asarray(codes, dtype=np.uint8)[..., None] >> np.arange(6, dtype=np.uint8)) & 1
 
-        # Find the trigram names
-        lower_name = ""
-        upper_name = ""
+    @staticmethod
+    def transform_codes(codes: np.ndarray, changing: np.ndarray) -> np.ndarray:
+        """Change the changing lines of hexagram code arrays - a single XOR"""
+        return np.bitwise_xor(codes, changing)
 
-        for name, trigram in self.trigrams.items():
-            if trigram.lines == lower_lines:
-                lower_name = name
-            if trigram.lines == upper_lines:
-                upper_name = name
+    def _calculate_hexagram_number(self, lines: Union[HexagramCode, List[int]]) -> int:
+        """Calculate the King Wen number of a hexagram"""
+        return int(self.king_wen_numbers[self._hexagram_code(lines).code])
 
-        # Look up the hexagram if we have it
-        hexagram_number = self._calculate_hexagram_number(lines)
-        hexagram = self.hexagrams.get(hexagram_number)
+    def king_wen_number(self, codes: Any) -> np.ndarray:
+        """Look up the King Wen numbers of hexagram codes (scalar or array)"""
+        return self.king_wen_numbers[np.asarray(codes, dtype=np.intp)]
+
+    def analyze_hexagram(self, lines: Union[HexagramCode, List[int]]) -> Tuple[str, str, Optional[Hexagram]]:
+        """
+        Analyze a hexagram into its component trigrams.
 
-        return lower_name, upper_name, hexagram
+        Args:
+            lines: Six-line hexagram pattern, or a HexagramCode
+
+        Returns:
+            tuple: (lower_trigram_name, upper_trigram_name, hexagram_obj)
+        """
+        cast = self._hexagram_code(lines)
+        return self.trigrams_by_code[cast.lower], self.trigrams_by_code[cast.upper], self.hexagrams_by_code[cast.code]
 
     def calculate_flying_star_chart(self, facing_direction: str, period: Optional[int] = None) -> np.ndarray:
         """
@@ -356,29 +680,16 @@ class XuanDaoCore:
 
         return adjusted_chart
 
-    def calculate_element_balance(self, birth_year: int, birth_month: int, birth_day: int) -> ElementBalance:
+    def _initialize_element_balance_table(self):
         """
-        Calculate a person's element balance based on birth date.
-
-        Args:
-            birth_year, birth_month, birth_day: Date components
+        Precompute the element balance of every possible birth pattern.
 
-        Returns:
-            ElementBalance: Element balance information
+        A balance depends only on the year's place in the sixty-year cycle, the birth month
+        and the day stem, so all 60 x 12 x 10 patterns are scored once. Patterns sharing the
+        same element counts share one signature, and one ElementBalance object per signature.
         """
-        # Calculate stems and branches for birth date
-        stem_idx = (birth_year - 4) % 10
-        branch_idx = (birth_year - 4) % 12
-
-        year_stem = self.heavenly_stems[stem_idx]
-        year_branch = self.earthly_branches[branch_idx]
-
-        # Get the elements
-        year_stem_element = self.stem_element_map[year_stem]
-        year_branch_element = self.branch_element_map[year_branch]
-
         # Month element (simplified)
-        month_elements = [
+        self.month_elements = [
             Element.WATER, Element.WATER,  # Jan, Feb
             Element.WOOD, Element.WOOD,  # Mar, Apr
             Element.EARTH,  # May
@@ -388,50 +699,150 @@ class XuanDaoCore:
             Element.EARTH,  # Nov
             Element.WATER  # Dec
         ]
-        month_element = month_elements[birth_month - 1]
 
-        # Day element (simplified)
+        stem_codes = self.stem_element_codes
+        branch_codes = self.branch_element_codes
+        month_codes = np.array([ELEMENT_CODES[element] for element in self.month_elements])
+
+        # Count elements: year stem and branch weigh 2, month and day stem weigh 1
+        cycle = np.arange(60)
+        one_hot = np.eye(len(ELEMENT_ORDER), dtype=np.int8)
+        counts = (2 * one_hot[stem_codes[cycle % 10]][:, None, None, :]
+                  + 2 * one_hot[branch_codes[cycle % 12]][:, None, None, :]
+                  + one_hot[month_codes][None, :, None, :]
+                  + one_hot[stem_codes][None, None, :, :])
+
+        # Collapse identical count vectors into shared signatures
+        signatures, table = np.unique(counts.reshape(-1, len(ELEMENT_ORDER)), axis=0, return_inverse=True)
+        self.balance_table = table.reshape(counts.shape[:3]).astype(np.uint16)
+        self.balance_counts = signatures.astype(np.int8)
+
+        # Strongest and weakest take the first element on ties, the recommended one generates the weakest
+        self.balance_strongest = np.argmax(signatures, axis=1).astype(np.uint8)
+        self.balance_weakest = np.argmin(signatures, axis=1).astype(np.uint8)
+        self.balance_recommended = self.generated_by_codes[self.balance_weakest].astype(np.uint8)
+
+        balancing_activities = self._generate_balancing_activities({})
+        self.balance_signatures = [
+            ElementBalance(
+                element_counts={element: int(count) for element, count in zip(ELEMENT_ORDER, signature)},
+                strongest=ELEMENT_ORDER[strongest],
+                weakest=ELEMENT_ORDER[weakest],
+                recommended=ELEMENT_ORDER[recommended],
+                balancing_activities=balancing_activities
+            )
+            for signature, strongest, weakest, recommended in zip(
+                signatures, self.balance_strongest, self.balance_weakest, self.balance_recommended)
+        ]
+
+    def _initialize_seasonal_strength_table(self):
+        """
+        Precompute the seasonal strength (旺相休囚死) of every element in every month.
+
+        An element's strength follows from its relation to the element ruling the month:
+        the ruler is prosperous, what it produces strong, what produces it resting, what
+        restrains it trapped, and what it restrains dead.
+        """
+        relation_strengths = np.zeros(len(ElementRelation), dtype=np.uint8)
+        relation_strengths[ElementRelation.SAME] = SeasonalStrength.PROSPEROUS
+        relation_strengths[ElementRelation.GENERATES] = SeasonalStrength.STRONG
+        relation_strengths[ElementRelation.GENERATED_BY] = SeasonalStrength.RESTING
+        relation_strengths[ElementRelation.CONTROLLED_BY] = SeasonalStrength.TRAPPED
+        relation_strengths[ElementRelation.CONTROLS] = SeasonalStrength.DEAD
+
+        # Strength of each element (column) under each ruling element (row)
+        self.ruler_strength = relation_strengths[self.relation_matrix]
+
+        # By Gregorian month (the month element table), and by month branch for pillar charts
+        month_codes = np.array([ELEMENT_CODES[element] for element in self.month_elements])
+        self.seasonal_strength = self.ruler_strength[month_codes]
+        self.branch_seasonal_strength = self.ruler_strength[self.branch_element_codes]
+
+        # Weight of an element's count by its seasonal strength
+        self.seasonal_strength_weights = {
+            SeasonalStrength.PROSPEROUS: 1.5,
+            SeasonalStrength.STRONG: 1.25,
+            SeasonalStrength.RESTING: 1.0,
+            SeasonalStrength.TRAPPED: 0.75,
+            SeasonalStrength.DEAD: 0.5
+        }
+        self.seasonal_weight_table = np.array([self.seasonal_strength_weights[strength]
+                                               for strength in SeasonalStrength])
+
+    def element_strengths(self, months: Any, element_codes: Any) -> np.ndarray:
+        """
+        Look up the seasonal strength of elements in months.
+
+        Args:
+            months: Month numbers (1-12), broadcastable against element_codes
+            element_codes: Element codes
+
+        Returns:
+            numpy.ndarray: SeasonalStrength codes
+        """
+        return self.seasonal_strength[np.asarray(months) - 1, np.asarray(element_codes)]
+
+    def seasonal_element_counts(self, counts: np.ndarray, months: Any) -> np.ndarray:
+        """
+        Weight element count vectors by the seasonal strength of each element.
+
+        Args:
+            counts: (..., 5) element counts in element order
+            months: Month numbers (1-12), one per count vector
+
+        Returns:
+            numpy.ndarray: (..., 5) seasonally weighted counts
+        """
+        strengths = self.seasonal_strength[np.asarray(months) - 1]
+        return np.asarray(counts) * self.seasonal_weight_table[strengths]
+
+    def day_seasonal_strengths(self, years: Any, months: Any, days: Any) -> np.ndarray:
+        """
+        Seasonal strength of each day's combined element in its month.
+
+        Args:
+            years, months, days: Integer arrays of date components
+
+        Returns:
+            numpy.ndarray: SeasonalStrength codes
+        """
+        day_elements = self.day_combined_elements[self.calculate_day_codes(years, months, days)]
+        return self.element_strengths(months, day_elements)
+
+    def calculate_element_balance(self, birth_year: int, birth_month: int, birth_day: int) -> ElementBalance:
+        """
+        Calculate a person's element balance based on birth date.
+
+        The balance is read from the precomputed table and shared between all birth dates
+        with the same signature, so it must be treated as read-only.
+
+        Args:
+            birth_year, birth_month, birth_day: Date components
+
+        Returns:
+            ElementBalance: Element balance information
+        """
         day_stem_idx = ((birth_year - 1900) * 365 + birth_month * 30 + birth_day) % 10
-        day_stem = self.heavenly_stems[day_stem_idx]
-        day_element = self.stem_element_map[day_stem]
+        code = self.balance_table[(birth_year - 4) % 60, birth_month - 1, day_stem_idx]
+        return self.balance_signatures[code]
 
-        # Count elements
-        element_count = {element: 0 for element in Element}
+    def calculate_element_balance_codes(self, birth_years: Any, birth_months: Any, birth_days: Any) -> np.ndarray:
+        """
+        Calculate element balance signature codes for arrays of birth dates.
 
-        element_count[year_stem_element] += 2
-        element_count[year_branch_element] += 2
-        element_count[month_element] += 1
-        element_count[day_element] += 1
+        Args:
+            birth_years, birth_months, birth_days: Integer arrays of date components
 
-        # Determine strongest and weakest elements
-        strongest = max(element_count.items(), key=lambda x: x[1])
-        weakest = min(element_count.items(), key=lambda x: x[1])
+        Returns:
+            numpy.ndarray: Signature codes indexing balance_signatures, balance_counts,
+            balance_strongest, balance_weakest and balance_recommended
+        """
+        birth_years = np.asarray(birth_years, dtype=np.int64)
+        birth_months = np.asarray(birth_months, dtype=np.int64)
+        birth_days = np.asarray(birth_days, dtype=np.int64)
 
-        # Determine recommended element to cultivate (typically the one that generates the weakest)
-        for element in Element:
-            if self.elements[element].generates == weakest[0]:
-                recommended = element
-                break
-        else:
-            # Default to the element that generates the strongest
-            strongest_element = strongest[0]
-            for element in Element:
-                if self.elements[element].generates == strongest_element:
-                    recommended = element
-                    break
-            else:
-                recommended = Element.EARTH  # Default to Earth as balanced center
-
-        # Create balancing activities
-        balancing_activities = self._generate_balancing_activities(element_count)
-
-        return ElementBalance(
-            element_counts=element_count,
-            strongest=strongest[0],
-            weakest=weakest[0],
-            recommended=recommended,
-            balancing_activities=balancing_activities
-        )
+        day_stem_idx = ((birth_years - 1900) * 365 + birth_months * 30 + birth_days) % 10
+        return self.balance_table[(birth_years - 4) % 60, birth_months - 1, day_stem_idx]
 
     def _generate_balancing_activities(self, element_count: Dict[Element, int]) -> Dict[Element, List[str]]:
         """Generate activities to balance elements"""
@@ -502,26 +913,13 @@ class XuanDaoCore:
         energy_quality = []
 
         # Element interaction
-        if stem_branch.stem_element == stem_branch.branch_element:
-            energy_quality.append("Strong elemental harmony")
-        elif self.elements[stem_branch.stem_element].generates == stem_branch.branch_element:
-            energy_quality.append("Productive, generative energy")
-        elif self.elements[stem_branch.stem_element].controlled_by == stem_branch.branch_element:
-            energy_quality.append("Controlling, restrictive energy")
-        else:
-            energy_quality.append("Mixed, complex energy")
+        energy_quality.append(self._element_interaction_quality(stem_branch.stem_element, stem_branch.branch_element))
 
-        # Season alignment
-        month_seasons = [
-            "winter", "winter", "spring", "spring", "spring",
-            "summer", "summer", "summer", "autumn", "autumn", "autumn", "winter"
-        ]
-        current_season = month_seasons[month - 1]
-
-        stem_season = self.elements[stem_branch.stem_element].season
-        if current_season == stem_season:
+        # Season alignment: the stem element rules the month, or the month's element restrains it
+        strength = self.seasonal_strength[month - 1, ELEMENT_CODES[stem_branch.stem_element]]
+        if strength == SeasonalStrength.PROSPEROUS:
             energy_quality.append("In season, naturally supported energy")
-        elif current_season == self.elements[stem_branch.stem_element].controlled_by:
+        elif strength == SeasonalStrength.DEAD:
             energy_quality.append("Against seasonal energy, requiring adaptation")
 
         # Determine the flying star for the day (simplified)
@@ -548,6 +946,46 @@ class XuanDaoCore:
             challenging=challenging
         )
 
+    def _element_interaction_quality(self, stem_element: Element, branch_element: Element) -> str:
+        """Describe the energy quality of a stem and branch element interaction"""
+        relation = self.relation_matrix[ELEMENT_CODES[stem_element], ELEMENT_CODES[branch_element]]
+
+        if relation == ElementRelation.SAME:
+            return "Strong elemental harmony"
+        elif relation == ElementRelation.GENERATES:
+            return "Productive, generative energy"
+        elif relation == ElementRelation.CONTROLLED_BY:
+            return "Controlling, restrictive energy"
+        else:
+            return "Mixed, complex energy"
+
+    def _initialize_day_energy_table(self):
+        """Precompute the combined element and interaction quality of the sixty day codes"""
+        codes = np.arange(60)
+        stem_codes = self.stem_element_codes[codes % 10]
+        branch_codes = self.branch_element_codes[codes % 12]
+
+        self.day_combined_elements = self.dominant_matrix[stem_codes, branch_codes].astype(np.uint8)
+        self.day_element_qualities = [self._element_interaction_quality(ELEMENT_ORDER[stem], ELEMENT_ORDER[branch])
+                                      for stem, branch in zip(stem_codes, branch_codes)]
+
+    def calculate_day_codes(self, years: Any, months: Any, days: Any) -> np.ndarray:
+        """
+        Calculate the day codes (position in the sixty-day cycle) for arrays of dates.
+
+        Args:
+            years, months, days: Integer arrays of date components
+
+        Returns:
+            numpy.ndarray: Day codes; code % 10 is the day stem and code % 12 the day branch
+        """
+        years = np.asarray(years, dtype=np.int64)
+        months = np.asarray(months, dtype=np.int64)
+        days = np.asarray(days, dtype=np.int64)
+
+        # Same simplified day count as calculate_chinese_date
+        return ((years - 1900) * 365 + months * 30 + days) % 60
+
     def _calculate_element_flow(self, start_element: Element) -> List[Element]:
         """Calculate the flow of elements starting from a given element"""
         flow = [start_element]
@@ -663,68 +1101,42 @@ class XuanDaoCore:
         # Add challenges based on energy quality
         if "Controlling, restrictive energy" in energy_qualities:
             challenges.append("Resistance and power struggles")
-        if "Against seasonal energy" in energy_qualities:
+        if "Against seasonal energy, requiring adaptation" in energy_qualities:
             challenges.append("Working against natural cycles")
 
         return challenges
 
-    def interpret_hexagram(self, hexagram_lines: List[int], changing_lines: List[int]) -> Dict[str, Any]:
+    def interpret_hexagram(self, hexagram_lines: Union[HexagramCode, List[int]],
+                           changing_lines: Optional[List[int]] = None) -> Dict[str, Any]:
         """
         Interpret a hexagram and its changing lines.
 
         Args:
-            hexagram_lines: The six lines of the hexagram
-            changing_lines: Indices of changing lines
+            hexagram_lines: The six lines of the hexagram, or a HexagramCode
+            changing_lines: Indices of changing lines (taken from the code if omitted)
 
         Returns:
             dict: Interpretation details
         """
-        # Analyze the primary hexagram
-        lower_trigram, upper_trigram, hexagram = self.analyze_hexagram(hexagram_lines)
+        cast = self._hexagram_code(hexagram_lines, changing_lines)
+        lower_trigram, upper_trigram = self.trigrams_by_code[cast.lower], self.trigrams_by_code[cast.upper]
 
         interpretation = {
-            "primary_hexagram": {
-                "lower_trigram": lower_trigram,
-                "upper_trigram": upper_trigram
-            }
+            "primary_hexagram": self._describe_hexagram(cast.code)
         }
 
-        # If we have the hexagram in our database, add its information
-        if hexagram:
-            interpretation["primary_hexagram"].update({
-                "number": hexagram.number,
-                "name": f"{hexagram.chinese_name} - {hexagram.english_name}",
-                "description": hexagram.description,
-                "judgment": hexagram.judgment,
-                "image": hexagram.image
-            })
-
-        # If there are changing lines, calculate the transformed hexagram
-        if changing_lines:
-            # Create the transformed hexagram
-            transformed_lines = hexagram_lines.copy()
-            for line_idx in changing_lines:
-                # Flip the line (0->1, 1->0)
-                transformed_lines[line_idx] = 1 - transformed_lines[line_idx]
-
-            # Analyze the transformed hexagram
-            trans_lower, trans_upper, trans_hexagram = self.analyze_hexagram(transformed_lines)
-
-            interpretation["changing_lines"] = changing_lines
-            interpretation["transformed_hexagram"] = {
-                "lower_trigram": trans_lower,
-                "upper_trigram": trans_upper
-            }
-
-            # If we have the transformed hexagram in our database, add its information
-            if trans_hexagram:
-                interpretation["transformed_hexagram"].update({
-                    "number": trans_hexagram.number,
-                    "name": f"{trans_hexagram.chinese_name} - {trans_hexagram.english_name}",
-                    "description": trans_hexagram.description,
-                    "judgment": trans_hexagram.judgment,
-                    "image": trans_hexagram.image
-                })
+        # If there are changing lines, read the transformed hexagram from the transition table
+        if cast.changing:
+            interpretation["changing_lines"] = cast.changing_lines
+            interpretation["transformed_hexagram"] = self._describe_hexagram(
+                int(self.changing_transitions[cast.code, cast.changing]))
+
+        # Hexagrams hidden within and mirrored by the primary one
+        interpretation["related_hexagrams"] = {
+            "nuclear": self._describe_hexagram(int(self.nuclear_codes[cast.code])),
+            "inverse": self._describe_hexagram(int(self.inverse_codes[cast.code])),
+            "complement": self._describe_hexagram(int(self.complement_codes[cast.code]))
+        }
 
         # Add elemental analysis
         if lower_trigram in self.trigrams and upper_trigram in self.trigrams:
@@ -739,36 +1151,70 @@ class XuanDaoCore:
 
         return interpretation
 
+    def _describe_hexagram(self, code: int) -> Dict[str, Any]:
+        """Summarize the hexagram with a code: its trigrams and, if known, its texts"""
+        description = {
+            "lower_trigram": self.trigrams_by_code[code & 0b111],
+            "upper_trigram": self.trigrams_by_code[code >> 3]
+        }
+
+        hexagram = self.hexagrams_by_code[code]
+        if hexagram:
+            description.update({
+                "number": hexagram.number,
+                "name": f"{hexagram.chinese_name} - {hexagram.english_name}",
+                "description": hexagram.description,
+                "judgment": hexagram.judgment,
+                "image": hexagram.image
+            })
+
+        return description
+
+    def related_hexagrams(self, codes: Any) -> Dict[str, np.ndarray]:
+        """
+        Look up the nuclear, inverse and complement hexagrams of hexagram codes.
+
+        Args:
+            codes: Hexagram codes (scalar or array)
+
+        Returns:
+            dict: Codes of the related hexagrams, by relation
+        """
+        codes = np.asarray(codes, dtype=np.intp)
+        return {
+            "nuclear": self.nuclear_codes[codes],
+            "inverse": self.inverse_codes[codes],
+            "complement": self.complement_codes[codes]
+        }
+
     def _analyze_trigram_elements(self, lower_element: Element, upper_element: Element) -> Dict[str, str]:
         """Analyze the interaction between trigram elements"""
-        analysis = {}
-
-        if lower_element == upper_element:
-            analysis["relationship"] = "Harmony"
-            analysis[
-                "description"] = f"Both trigrams share the {lower_element.value} element, creating resonance and internal harmony."
-        elif self.elements[lower_element].generates == upper_element:
-            analysis["relationship"] = "Generation"
-            analysis[
-                "description"] = f"The lower {lower_element.value} element generates the upper {upper_element.value} element, creating supportive upward growth."
-        elif self.elements[upper_element].generates == lower_element:
-            analysis["relationship"] = "Descent"
-            analysis[
-                "description"] = f"The upper {upper_element.value} element generates the lower {lower_element.value} element, suggesting nourishment flowing downward."
-        elif self.elements[lower_element].controlled_by == upper_element:
-            analysis["relationship"] = "Control"
-            analysis[
-                "description"] = f"The upper {upper_element.value} element controls the lower {lower_element.value} element, suggesting restraint of the foundation."
-        elif self.elements[upper_element].controlled_by == lower_element:
-            analysis["relationship"] = "Restraint"
-            analysis[
-                "description"] = f"The lower {lower_element.value} element controls the upper {upper_element.value} element, suggesting a foundation that limits expression."
-        else:
-            analysis["relationship"] = "Neutral"
-            analysis[
-                "description"] = f"The {lower_element.value} and {upper_element.value} elements have no direct relationship, suggesting independence of action."
+        lower = lower_element.value
+        upper = upper_element.value
+
+        # Relation of the lower element toward the upper element
+        analyses = {
+            ElementRelation.SAME: (
+                "Harmony",
+                f"Both trigrams share the {lower} element, creating resonance and internal harmony."),
+            ElementRelation.GENERATES: (
+                "Generation",
+                f"The lower {lower} element generates the upper {upper} element, creating supportive upward growth."),
+            ElementRelation.GENERATED_BY: (
+                "Descent",
+                f"The upper {upper} element generates the lower {lower} element, suggesting nourishment flowing downward."),
+            ElementRelation.CONTROLLED_BY: (
+                "Control",
+                f"The upper {upper} element controls the lower {lower} element, suggesting restraint of the foundation."),
+            ElementRelation.CONTROLS: (
+                "Restraint",
+                f"The lower {lower} element controls the upper {upper} element, suggesting a foundation that limits expression.")
+        }
 
-        return analysis
+        relation = self.relation_matrix[ELEMENT_CODES[lower_element], ELEMENT_CODES[upper_element]]
+        relationship, description = analyses[ElementRelation(relation)]
+
+        return {"relationship": relationship, "description": description}
 
     def _generate_timing_guidance(self, day_energy: DayEnergy) -> Dict[str, str]:
         """Generate timing guidance based on the day's energy"""
@@ -811,16 +1257,10 @@ class XuanDaoCore:
         guidance["daily_rhythm"] += f"• {element_times[stem_element]} (Today's focus)\n"
 
         # Add times for supportive elements (generating and generated)
-        generating_element = None
-        for element in Element:
-            if self.elements[element].generates == stem_element:
-                generating_element = element
-                break
-
-        generated_element = self.elements[stem_element].generates
+        generating_element = ELEMENT_ORDER[self.generated_by_codes[ELEMENT_CODES[stem_element]]]
+        generated_element = ELEMENT_ORDER[self.generates_codes[ELEMENT_CODES[stem_element]]]
 
-        if generating_element:
-            guidance["daily_rhythm"] += f"• {element_times[generating_element]} (Supportive energy)\n"
+        guidance["daily_rhythm"] += f"• {element_times[generating_element]} (Supportive energy)\n"
 
         guidance["daily_rhythm"] += f"• {element_times[generated_element]} (Flowing energy)\n"
 
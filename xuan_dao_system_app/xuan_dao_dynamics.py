@@ -0,0 +1,310 @@
+# 🌀 XUÁN DÀO DYNAMICS: THE FIVE PHASES IN MOTION 🌀
+
+import datetime
+
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+from xuan_dao_structures import Element, ElementBalance, ElementRelation, ELEMENT_ORDER
+from xuan_dao_core import XuanDaoCore, split_dates
+
+
+class XuanDaoDynamics:
+    """
+    The five elements as a state vector evolving under generation and control.
+
+    Each step, every element passes a share of its energy to the element it generates,
+    and loses a share to the element that controls it; the rest is retained. The
+    transition matrix is column-stochastic, so total energy is conserved, and its
+    eigen-decomposition gives any future state and the steady state directly.
+    """
+
+    def __init__(self, core: XuanDaoCore, generation: Union[float, Sequence[float]] = 0.2,
+                 control: Union[float, Sequence[float]] = 0.1):
+        """
+        Initialize with reference to the XuanDaoCore.
+
+        Args:
+            core: The XuanDaoCore
+            generation: Share of each element's energy passed to the element it generates
+                (one value, or one per element in element order)
+            control: Share of each element's energy drained by the element controlling it
+                (one value, or one per element in element order)
+        """
+        self.core = core
+        self.generation = np.broadcast_to(np.asarray(generation, dtype=np.float64), len(ELEMENT_ORDER)).copy()
+        self.control = np.broadcast_to(np.asarray(control, dtype=np.float64), len(ELEMENT_ORDER)).copy()
+
+        if np.any(self.generation + self.control > 1) or np.any(self.generation < 0) or np.any(self.control < 0):
+            raise ValueError("Generation and control shares must be non-negative and sum to at most 1")
+
+        # Column j holds where element j's energy goes: new_state = transition @ state
+        codes = np.arange(len(ELEMENT_ORDER))
+        controlled_by = np.argmax(core.relation_matrix == ElementRelation.CONTROLLED_BY, axis=1)
+        self.transition = np.diag(1.0 - self.generation - self.control)
+        self.transition[core.generates_codes, codes] += self.generation
+        self.transition[controlled_by, codes] += self.control
+
+        self.eigenvalues, self.eigenvectors = np.linalg.eig(self.transition)
+        self.inverse_eigenvectors = np.linalg.inv(self.eigenvectors)
+
+        # Projector onto the eigenvalue-1 eigenspace along the others: V (U^T V)^-1 U^T from the
+        # right (V) and left (U) null spaces of transition - I. Eigenvalue 1 of a stochastic
+        # matrix is semisimple, so U^T V is invertible even when the chain is reducible.
+        left, singular_values, right = np.linalg.svd(self.transition - np.eye(len(ELEMENT_ORDER)))
+        null = singular_values < 1e-9
+        if not null.any():
+            raise ValueError("The transition has no eigenvalue 1")
+        stationary, conserved = right[null].T, left[:, null]
+        self.stationary_states = stationary
+        self.steady_projector = stationary @ np.linalg.inv(conserved.T @ stationary) @ conserved.T
+
+    @staticmethod
+    def balance_state(balance: ElementBalance) -> np.ndarray:
+        """Convert an element balance into a state vector"""
+        return np.array([balance.element_counts[element] for element in ELEMENT_ORDER], dtype=np.float64)
+
+    def step(self, states: np.ndarray) -> np.ndarray:
+        """
+        Advance states by one step.
+
+        Args:
+            states: (5,) state or (N, 5) batch of states
+
+        Returns:
+            numpy.ndarray: States after one step
+        """
+        return np.asarray(states, dtype=np.float64) @ self.transition.T
+
+    def simulate(self, initial_states: np.ndarray, steps: int) -> np.ndarray:
+        """
+        Iterate states through time.
+
+        Args:
+            initial_states: (5,) state or (N, 5) batch of states
+            steps: Number of steps
+
+        Returns:
+            numpy.ndarray: (steps + 1, ..., 5) time series, initial state first
+        """
+        states = np.asarray(initial_states, dtype=np.float64)
+        series = np.empty((steps + 1,) + states.shape)
+        series[0] = states
+
+        for t in range(steps):
+            series[t + 1] = series[t] @ self.transition.T
+
+        return series
+
+    def state_at(self, initial_states: np.ndarray, t: int) -> np.ndarray:
+        """
+        Compute the states after t steps directly from the eigen-decomposition.
+
+        Args:
+            initial_states: (5,) state or (N, 5) batch of states
+            t: Number of steps
+
+        Returns:
+            numpy.ndarray: States after t steps
+        """
+        if np.linalg.cond(self.eigenvectors) > 1e8:
+            # Defective transition (some elements pass no energy on): no eigenbasis, square up instead
+            propagator = np.linalg.matrix_power(self.transition, t)
+        else:
+            propagator = (self.eigenvectors * self.eigenvalues ** t) @ self.inverse_eigenvectors
+        return np.asarray(initial_states, dtype=np.float64) @ propagator.real.T
+
+    def steady_state(self, initial_states: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Compute the long-run (time-averaged) state by projecting onto the eigenvalue-1 eigenspace.
+
+        Args:
+            initial_states: (5,) state or (N, 5) batch of states; if omitted, the
+                steady-state element shares are returned
+
+        Returns:
+            numpy.ndarray: Long-run states, keeping each initial state's total energy
+        """
+        if initial_states is None:
+            if self.stationary_states.shape[1] > 1:
+                raise ValueError("The steady state depends on the initial state when some elements "
+                                 "pass no energy on; pass initial_states")
+            stationary = self.stationary_states[:, 0]
+            return stationary / stationary.sum()
+
+        return np.asarray(initial_states, dtype=np.float64) @ self.steady_projector.T
+
+    def steady_state_by_element(self) -> Dict[Element, float]:
+        """Steady-state share of each element"""
+        return {element: float(share) for element, share in zip(ELEMENT_ORDER, self.steady_state())}
+
+
+# 📉 Monte Carlo Bands - Percentile envelopes of simulated element energies
+@dataclass
+class MonteCarloBands:
+    dates: np.ndarray  # datetime64 dates, initial state first
+    percentiles: Tuple[float, ...]  # Percentiles of the bands
+    bands: np.ndarray  # (percentiles, days + 1, 5) energy at each percentile
+    mean: np.ndarray  # (days + 1, 5) mean energy
+    n_paths: int  # Number of simulated paths
+    seed: int  # Root seed entropy, reproduces the run
+
+
+def _simulate_path_batch(transition: np.ndarray, day_elements: np.ndarray, initial_state: np.ndarray,
+                         n_paths: int, drive: float, decay: float, volatility: float,
+                         seed: np.random.SeedSequence, bin_edges: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Simulate one batch of noisy paths and reduce it to histograms.
+
+    Returns:
+        tuple: (histograms (days + 1, 5, bins), sums (days + 1, 5))
+    """
+    rng = np.random.default_rng(seed)
+    n_elements = len(initial_state)
+    n_bins = len(bin_edges) - 1
+    element_offsets = np.arange(n_elements) * n_bins
+
+    histograms = np.zeros((len(day_elements) + 1, n_elements, n_bins), dtype=np.int64)
+    sums = np.zeros((len(day_elements) + 1, n_elements))
+
+    # Uniform bins: the bin index is a scaled floor, out-of-range energies land in the edge bins
+    bin_width = bin_edges[1] - bin_edges[0]
+
+    def record(t: int, states: np.ndarray):
+        bins = np.clip(((states - bin_edges[0]) / bin_width).astype(np.int64), 0, n_bins - 1)
+        histograms[t] = np.bincount((bins + element_offsets).ravel(),
+                                    minlength=n_elements * n_bins).reshape(n_elements, n_bins)
+        sums[t] = states.sum(axis=0)
+
+    states = np.tile(np.asarray(initial_state, dtype=np.float64), (n_paths, 1))
+    record(0, states)
+
+    # Mean-one lognormal shocks on the energy each day brings to its element
+    retained = (1.0 - decay) * transition.T
+    for t, day_element in enumerate(day_elements):
+        shocks = np.exp(volatility * rng.standard_normal(n_paths) - 0.5 * volatility ** 2)
+        states = states @ retained
+        states[:, day_element] += drive * shocks
+        record(t + 1, states)
+
+    return histograms, sums
+
+
+class XuanDaoMonteCarlo:
+    """
+    Monte Carlo ensembles of element energies driven by the energy of each day.
+
+    Every simulated day, each path's state evolves under the dynamics transition with a
+    small decay, and the day's combined element receives a randomly scaled boost. Paths
+    run in fixed-size batches, each with its own child seed, so the result depends only
+    on the root seed - not on how many processes share the work.
+    """
+
+    def __init__(self, dynamics: XuanDaoDynamics, drive: float = 1.0, decay: float = 0.1,
+                 volatility: float = 0.5):
+        """
+        Initialize with reference to the element dynamics.
+
+        Args:
+            dynamics: The XuanDaoDynamics defining the transition
+            drive: Mean energy a day adds to its combined element
+            decay: Share of energy lost each day
+            volatility: Standard deviation of the log of each day's boost
+        """
+        if not 0 < decay <= 1:
+            raise ValueError(f"Decay must be in (0, 1], got {decay}")
+        if drive < 0 or volatility < 0:
+            raise ValueError("Drive and volatility must be non-negative")
+
+        self.dynamics = dynamics
+        self.core = dynamics.core
+        self.drive = drive
+        self.decay = decay
+        self.volatility = volatility
+
+    def simulate_bands(self, initial_state: np.ndarray, start_date: datetime.date, end_date: datetime.date,
+                       n_paths: int = 100_000, percentiles: Sequence[float] = (5, 25, 50, 75, 95),
+                       seed: Optional[int] = None, workers: int = 0, batch_size: int = 10_000,
+                       bins: int = 1024, max_energy: Optional[float] = None) -> MonteCarloBands:
+        """
+        Simulate an ensemble over a date range and reduce it to percentile bands.
+
+        Args:
+            initial_state: (5,) starting element energies
+            start_date, end_date: Inclusive date range driving the simulation
+            n_paths: Number of simulated paths
+            percentiles: Percentiles of the bands
+            seed: Root seed for a reproducible run (fresh entropy if omitted)
+            workers: Number of worker processes (0 = simulate in this process)
+            batch_size: Paths per batch; each batch gets its own random stream
+            bins: Histogram bins per element, setting the percentile resolution
+            max_energy: Upper histogram edge (estimated from the dynamics if omitted)
+
+        Returns:
+            MonteCarloBands: Percentile bands and mean of the ensemble
+        """
+        if n_paths <= 0:
+            raise ValueError(f"Need at least one path, got {n_paths}")
+
+        initial_state = np.asarray(initial_state, dtype=np.float64)
+        dates = np.arange(np.datetime64(start_date, "D"), np.datetime64(end_date, "D") + 1)
+        day_elements = self.core.day_combined_elements[self.core.calculate_day_codes(*split_dates(dates))]
+
+        if max_energy is None:
+            # Generous bound: several times the initial peak or the steady-state total
+            max_energy = 4.0 * max(initial_state.max(), self.drive / self.decay)
+        bin_edges = np.linspace(0.0, max_energy, bins + 1)
+
+        root = np.random.SeedSequence(seed)
+        batch_sizes = [min(batch_size, n_paths - start) for start in range(0, n_paths, batch_size)]
+        tasks = [(self.dynamics.transition, day_elements, initial_state, size, self.drive, self.decay,
+                  self.volatility, child, bin_edges)
+                 for size, child in zip(batch_sizes, root.spawn(len(batch_sizes)))]
+
+        # Each batch is folded into the running totals as it finishes
+        histograms = np.zeros((len(dates) + 1, len(initial_state), bins), dtype=np.int64)
+        sums = np.zeros((len(dates) + 1, len(initial_state)))
+
+        if workers > 0:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for batch_histograms, batch_sums in executor.map(_simulate_path_batch, *zip(*tasks)):
+                    histograms += batch_histograms
+                    sums += batch_sums
+        else:
+            for task in tasks:
+                batch_histograms, batch_sums = _simulate_path_batch(*task)
+                histograms += batch_histograms
+                sums += batch_sums
+
+        return MonteCarloBands(
+            dates=np.concatenate([dates[:1] - 1, dates]),
+            percentiles=tuple(percentiles),
+            bands=self._histogram_percentiles(histograms, bin_edges, percentiles),
+            mean=sums / n_paths,
+            n_paths=n_paths,
+            seed=root.entropy
+        )
+
+    @staticmethod
+    def _histogram_percentiles(histograms: np.ndarray, bin_edges: np.ndarray,
+                               percentiles: Sequence[float]) -> np.ndarray:
+        """Interpolate percentiles from merged histograms, linearly within each bin"""
+        cumulative = np.cumsum(histograms, axis=-1)
+        totals = cumulative[..., -1:]
+        widths = np.diff(bin_edges)
+
+        bands = []
+        for percentile in percentiles:
+            target = totals * percentile / 100.0
+            bin_idx = np.minimum(np.argmax(cumulative >= target, axis=-1), len(widths) - 1)[..., None]
+
+            below = np.take_along_axis(cumulative, bin_idx, axis=-1) - np.take_along_axis(histograms, bin_idx, axis=-1)
+            in_bin = np.maximum(np.take_along_axis(histograms, bin_idx, axis=-1), 1)
+            fraction = np.clip((target - below) / in_bin, 0.0, 1.0)
+
+            bands.append((bin_edges[bin_idx] + fraction * widths[bin_idx])[..., 0])
+
+        return np.stack(bands)
@@ -0,0 +1,132 @@
+# 🔍 XUÁN DÀO LOOKUP: FROM THE PATTERN BACK TO THE MOMENT OF BIRTH 🔍
+
+import numpy as np
+
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from xuan_dao_structures import Element, ELEMENT_ORDER, ELEMENT_CODES
+from xuan_dao_core import XuanDaoCore
+
+
+class XuanDaoBalanceIndex:
+    """
+    Inverted index from element balance signatures to the birth dates that produce them.
+
+    Every balance is fixed by the year's place in the sixty-year cycle, the month and the
+    day stem. The index maps each signature to those (cycle, month, day stem) cells, and a
+    query expands the matching cells arithmetically into dates - years step by sixty and
+    days step by ten - so no date outside the answer is ever visited.
+    """
+
+    def __init__(self, core: XuanDaoCore):
+        """Initialize with reference to the XuanDaoCore and build the index"""
+        self.core = core
+
+        # Count vector -> signature code
+        self.signature_lookup: Dict[Tuple[int, ...], int] = {
+            tuple(int(count) for count in counts): code for code, counts in enumerate(core.balance_counts)
+        }
+
+        # Signature code -> (cycle, month index, day stem) cells producing it
+        table = core.balance_table
+        flat_codes = table.ravel()
+        order = np.argsort(flat_codes, kind="stable")
+        boundaries = np.searchsorted(flat_codes[order], np.arange(1, len(core.balance_counts)))
+        cells = np.stack(np.unravel_index(order, table.shape), axis=1).astype(np.int16)
+        self.cells_by_signature: List[np.ndarray] = np.split(cells, boundaries)
+
+        # (strongest, weakest) -> signature codes
+        self.signatures_by_pair: Dict[Tuple[Element, Element], np.ndarray] = {}
+        for strongest in ELEMENT_ORDER:
+            for weakest in ELEMENT_ORDER:
+                codes = np.flatnonzero((core.balance_strongest == ELEMENT_CODES[strongest])
+                                       & (core.balance_weakest == ELEMENT_CODES[weakest]))
+                if len(codes):
+                    self.signatures_by_pair[(strongest, weakest)] = codes
+
+    def find_signatures(self, counts: Optional[Union[Dict[Element, int], Sequence[int]]] = None,
+                        strongest: Optional[Element] = None, weakest: Optional[Element] = None) -> np.ndarray:
+        """
+        Find the signature codes matching an exact count vector or a strongest/weakest pattern.
+
+        Args:
+            counts: Exact element counts, as a dict or a sequence in element order
+            strongest: Required strongest element
+            weakest: Required weakest element
+
+        Returns:
+            numpy.ndarray: Matching signature codes
+        """
+        if counts is not None:
+            if isinstance(counts, dict):
+                counts = [counts.get(element, 0) for element in ELEMENT_ORDER]
+            code = self.signature_lookup.get(tuple(int(count) for count in counts))
+            codes = np.array([] if code is None else [code], dtype=np.int64)
+        else:
+            codes = np.arange(len(self.core.balance_counts))
+
+        if strongest is not None:
+            codes = codes[self.core.balance_strongest[codes] == ELEMENT_CODES[strongest]]
+        if weakest is not None:
+            codes = codes[self.core.balance_weakest[codes] == ELEMENT_CODES[weakest]]
+
+        return codes
+
+    def find_dates(self, start_year: int, end_year: int,
+                   counts: Optional[Union[Dict[Element, int], Sequence[int]]] = None,
+                   strongest: Optional[Element] = None, weakest: Optional[Element] = None,
+                   as_ordinals: bool = False) -> np.ndarray:
+        """
+        Find all birth dates in a year range whose balance matches the query.
+
+        Args:
+            start_year, end_year: Inclusive range of birth years
+            counts: Exact element counts, as a dict or a sequence in element order
+            strongest: Required strongest element
+            weakest: Required weakest element
+            as_ordinals: Return proleptic Gregorian ordinals instead of datetime64 dates
+
+        Returns:
+            numpy.ndarray: Sorted matching dates
+        """
+        codes = self.find_signatures(counts, strongest, weakest)
+
+        if len(codes) and end_year >= start_year:
+            cells = np.concatenate([self.cells_by_signature[code] for code in codes])
+            dates = np.sort(self._expand_cells(cells, start_year, end_year))
+        else:
+            dates = np.array([], dtype="datetime64[D]")
+
+        if as_ordinals:
+            # Day 0 of the epoch, 1970-01-01, is ordinal 719163
+            return dates.astype(np.int64) + 719163
+        return dates
+
+    def count_dates(self, start_year: int, end_year: int,
+                    counts: Optional[Union[Dict[Element, int], Sequence[int]]] = None,
+                    strongest: Optional[Element] = None, weakest: Optional[Element] = None) -> int:
+        """Count the birth dates in a year range whose balance matches the query"""
+        return len(self.find_dates(start_year, end_year, counts, strongest, weakest))
+
+    @staticmethod
+    def _expand_cells(cells: np.ndarray, start_year: int, end_year: int) -> np.ndarray:
+        """Expand (cycle, month index, day stem) cells into the dates they cover"""
+        cycle, month_idx, day_stem = (column.astype(np.int64) for column in cells.T)
+
+        # Years sharing the cell's place in the sixty-year cycle
+        first_year = start_year + (cycle - (start_year - 4)) % 60
+        n_cycles = (end_year - start_year) // 60 + 1
+        years = first_year[:, None] + 60 * np.arange(n_cycles)
+        months = (month_idx + 1)[:, None]
+
+        # The day stem fixes the day of the month modulo ten
+        first_day = (day_stem[:, None] - ((years - 1900) * 365 + months * 30)) % 10
+        days = first_day[..., None] + 10 * np.arange(4)
+
+        month_starts = ((years - 1970) * 12 + months - 1).astype("datetime64[M]")
+        month_lengths = ((month_starts + 1).astype("datetime64[D]")
+                         - month_starts.astype("datetime64[D]")).astype(np.int64)
+
+        valid = (days >= 1) & (days <= month_lengths[..., None]) & (years <= end_year)[..., None]
+        dates = month_starts.astype("datetime64[D]")[..., None] + (days - 1)
+        return dates[valid]
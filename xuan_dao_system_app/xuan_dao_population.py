@@ -0,0 +1,299 @@
+# 📈 XUÁN DÀO POPULATION: THE ELEMENTS OF THE TEN THOUSAND BEINGS 📈
+
+import codecs
+import itertools
+import os
+
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from xuan_dao_structures import Element, ELEMENT_ORDER
+from xuan_dao_core import XuanDaoCore, split_dates
+
+
+# 📊 Population Statistics - Element balances of many births
+@dataclass
+class PopulationStatistics:
+    signature_counts: Dict[int, np.ndarray]  # Birth decade -> count of each balance signature
+    balance_counts: np.ndarray  # Element counts of each signature
+    balance_strongest: np.ndarray  # Strongest element code of each signature
+    balance_weakest: np.ndarray  # Weakest element code of each signature
+
+    @property
+    def total(self) -> int:
+        """Number of birth dates aggregated"""
+        return int(sum(counts.sum() for counts in self.signature_counts.values()))
+
+    @property
+    def decades(self) -> List[int]:
+        """Birth decades present in the population, in order"""
+        return sorted(self.signature_counts)
+
+    def merge(self, other: "PopulationStatistics") -> "PopulationStatistics":
+        """Merge the histograms of another partial result into this one"""
+        for decade, counts in other.signature_counts.items():
+            if decade in self.signature_counts:
+                self.signature_counts[decade] = self.signature_counts[decade] + counts
+            else:
+                self.signature_counts[decade] = counts.copy()
+        return self
+
+    def element_distribution(self) -> Dict[Element, int]:
+        """Total weight of each element summed over all birth charts"""
+        totals = self._signature_totals() @ self.balance_counts.astype(np.int64)
+        return {element: int(total) for element, total in zip(ELEMENT_ORDER, totals)}
+
+    def strongest_histogram(self) -> Dict[Element, int]:
+        """Number of births with each element as strongest"""
+        histogram = self._element_histogram(self._signature_totals(), self.balance_strongest)
+        return {element: int(count) for element, count in zip(ELEMENT_ORDER, histogram)}
+
+    def weakest_histogram(self) -> Dict[Element, int]:
+        """Number of births with each element as weakest"""
+        histogram = self._element_histogram(self._signature_totals(), self.balance_weakest)
+        return {element: int(count) for element, count in zip(ELEMENT_ORDER, histogram)}
+
+    def strongest_weakest_table(self) -> np.ndarray:
+        """5x5 cross-tab of strongest (rows) against weakest (columns) element"""
+        n = len(ELEMENT_ORDER)
+        pair_codes = self.balance_strongest.astype(np.int64) * n + self.balance_weakest
+        table = np.bincount(pair_codes, weights=self._signature_totals(), minlength=n * n)
+        return table.astype(np.int64).reshape(n, n)
+
+    def decade_crosstab(self, kind: str = "strongest") -> Tuple[List[int], np.ndarray]:
+        """
+        Cross-tabulate birth decade against strongest or weakest element.
+
+        Args:
+            kind: "strongest" or "weakest"
+
+        Returns:
+            tuple: (decades, counts) with counts shaped (decades, 5)
+        """
+        element_codes = self.balance_strongest if kind == "strongest" else self.balance_weakest
+        decades = self.decades
+        table = np.array([self._element_histogram(self.signature_counts[decade], element_codes)
+                          for decade in decades], dtype=np.int64).reshape(len(decades), len(ELEMENT_ORDER))
+        return decades, table
+
+    def _signature_totals(self) -> np.ndarray:
+        """Signature histogram summed over all decades"""
+        totals = np.zeros(len(self.balance_counts), dtype=np.int64)
+        for counts in self.signature_counts.values():
+            totals += counts
+        return totals
+
+    @staticmethod
+    def _element_histogram(signature_counts: np.ndarray, element_codes: np.ndarray) -> np.ndarray:
+        """Fold a signature histogram onto the element each signature maps to"""
+        histogram = np.bincount(element_codes, weights=signature_counts, minlength=len(ELEMENT_ORDER))
+        return histogram.astype(np.int64)
+
+
+def _signature_histograms(core: XuanDaoCore, years: np.ndarray, months: np.ndarray,
+                          days: np.ndarray) -> Dict[int, np.ndarray]:
+    """Histogram the balance signatures of one chunk of birth dates by birth decade"""
+    if len(years) == 0:
+        return {}
+
+    n_signatures = len(core.balance_signatures)
+    codes = core.calculate_element_balance_codes(years, months, days).astype(np.int64)
+
+    # Decade rows relative to the earliest decade in the chunk
+    decade_rows = np.floor_divide(years, 10)
+    first_row = int(decade_rows.min())
+    decade_rows = decade_rows - first_row
+    n_rows = int(decade_rows.max()) + 1
+
+    flat = np.bincount(decade_rows * n_signatures + codes, minlength=n_rows * n_signatures)
+    table = flat.reshape(n_rows, n_signatures)
+
+    return {(first_row + int(row)) * 10: table[row] for row in np.flatnonzero(table.any(axis=1))}
+
+
+def _is_iso_line(line: str) -> bool:
+    """Whether a CSV line starts with an ISO date (separators after the leading year digits)"""
+    return "-" in line.split(",")[0].strip()[1:]
+
+
+def _parse_csv_lines(lines: Sequence[str], iso: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Parse CSV lines of ISO dates or year, month, day columns into date components"""
+    if iso:
+        return split_dates(np.loadtxt(lines, dtype="datetime64[D]", delimiter=",", usecols=0, ndmin=1))
+    return split_dates(np.loadtxt(lines, dtype=np.int64, delimiter=",", usecols=(0, 1, 2), ndmin=2))
+
+
+def _csv_layout(path: str) -> Tuple[int, bool, int]:
+    """
+    Locate the data of a CSV birth-date file.
+
+    Returns:
+        tuple: (byte offset of the first data line, whether dates are ISO, length of the first data line)
+    """
+    with open(path, "rb") as handle:
+        first_line = handle.readline()
+        offset = len(codecs.BOM_UTF8) if first_line.startswith(codecs.BOM_UTF8) else 0
+
+        if first_line[offset:offset + 1].isdigit():
+            sample = first_line[offset:]
+        else:
+            offset = handle.tell()
+            sample = handle.readline()
+
+    return offset, _is_iso_line(sample.decode("utf-8")), len(sample)
+
+
+def _csv_byte_ranges(path: str, start: int, chunk_bytes: int) -> List[Tuple[int, int]]:
+    """Split a CSV file from a byte offset into ranges of about chunk_bytes ending on line boundaries"""
+    size = os.path.getsize(path)
+    ranges = []
+
+    with open(path, "rb") as handle:
+        while start < size:
+            handle.seek(min(start + chunk_bytes, size))
+            handle.readline()
+            stop = min(handle.tell(), size)
+            ranges.append((start, stop))
+            start = stop
+
+    return ranges
+
+
+# 🧵 Process pool workers - each awakens its own core
+_worker_core: Optional[XuanDaoCore] = None
+
+
+def _initialize_worker():
+    """Create the core used by this worker process"""
+    global _worker_core
+    _worker_core = XuanDaoCore()
+
+
+def _histogram_csv_range(path: str, start: int, stop: int, iso: bool) -> Dict[int, np.ndarray]:
+    """Worker task: parse and histogram a line-aligned byte range of a CSV file"""
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        lines = [line for line in handle.read(stop - start).decode("utf-8").splitlines() if line.strip()]
+
+    if not lines:
+        return {}
+    return _signature_histograms(_worker_core, *_parse_csv_lines(lines, iso))
+
+
+def _histogram_npy_range(path: str, start: int, stop: int) -> Dict[int, np.ndarray]:
+    """Worker task: histogram a row range of a memory-mapped .npy file"""
+    dates = np.load(path, mmap_mode="r")
+    return _signature_histograms(_worker_core, *split_dates(dates[start:stop]))
+
+
+class XuanDaoPopulation:
+    """
+    Streaming element statistics over large populations of birth dates.
+
+    Birth dates are read in fixed-size chunks and reduced to histograms of balance
+    signatures per birth decade, so memory stays constant however long the input is.
+    """
+
+    def __init__(self, core: XuanDaoCore, chunk_size: int = 1_000_000):
+        """Initialize with reference to the XuanDaoCore"""
+        self.core = core
+        self.chunk_size = chunk_size
+
+    def empty_statistics(self) -> PopulationStatistics:
+        """Create statistics for an empty population"""
+        return PopulationStatistics(
+            signature_counts={},
+            balance_counts=self.core.balance_counts,
+            balance_strongest=self.core.balance_strongest,
+            balance_weakest=self.core.balance_weakest
+        )
+
+    def aggregate_dates(self, years: np.ndarray, months: np.ndarray, days: np.ndarray) -> PopulationStatistics:
+        """
+        Aggregate one in-memory chunk of birth dates.
+
+        Args:
+            years, months, days: Integer arrays of date components
+
+        Returns:
+            PopulationStatistics: Histograms of the chunk
+        """
+        years = np.asarray(years, dtype=np.int64)
+        statistics = self.empty_statistics()
+        statistics.signature_counts = _signature_histograms(self.core, years, months, days)
+        return statistics
+
+    def iter_chunks(self, path: str) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Read a birth-date file in chunks of (years, months, days) arrays.
+
+        `.npy` files hold datetime64 dates or an (N, 3) year/month/day array and are
+        memory-mapped. CSV files hold either an ISO date or year, month, day in their
+        leading columns, with an optional header line.
+        """
+        if path.endswith(".npy"):
+            dates = np.load(path, mmap_mode="r")
+            for start in range(0, len(dates), self.chunk_size):
+                yield split_dates(dates[start:start + self.chunk_size])
+            return
+
+        # utf-8-sig drops a byte order mark, which would otherwise hide a leading data row
+        with open(path, "r", encoding="utf-8-sig") as handle:
+            first_line = handle.readline()
+            lines = itertools.chain([first_line] if first_line[:1].isdigit() else [], handle)
+
+            while True:
+                chunk = list(itertools.islice(lines, self.chunk_size))
+                if not chunk:
+                    break
+                yield _parse_csv_lines(chunk, _is_iso_line(chunk[0]))
+
+    def aggregate_file(self, path: str, workers: int = 0) -> PopulationStatistics:
+        """
+        Aggregate element statistics over a CSV or .npy birth-date file.
+
+        Args:
+            path: Path to the birth-date file
+            workers: Number of worker processes (0 = aggregate in this process)
+
+        Returns:
+            PopulationStatistics: Merged histograms of the whole file
+        """
+        if not (path.endswith(".npy") or path.endswith(".csv")):
+            raise ValueError(f"Unsupported birth-date file: {path}")
+
+        statistics = self.empty_statistics()
+
+        if workers <= 0:
+            for years, months, days in self.iter_chunks(path):
+                statistics.merge(self.aggregate_dates(years, months, days))
+            return statistics
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_initialize_worker) as executor:
+            if path.endswith(".npy"):
+                # Workers map the file themselves, only row ranges cross process boundaries
+                n_rows = len(np.load(path, mmap_mode="r"))
+                starts = range(0, n_rows, self.chunk_size)
+                stops = [min(start + self.chunk_size, n_rows) for start in starts]
+                for partial in executor.map(_histogram_npy_range, itertools.repeat(os.fspath(path)), starts, stops):
+                    statistics.merge(self._wrap(partial))
+                return statistics
+
+            # Workers parse CSV byte ranges themselves, split on line boundaries of about chunk_size rows
+            data_start, iso, line_bytes = _csv_layout(path)
+            ranges = _csv_byte_ranges(path, data_start, self.chunk_size * max(line_bytes, 1))
+            starts, stops = [start for start, _ in ranges], [stop for _, stop in ranges]
+            for partial in executor.map(_histogram_csv_range, itertools.repeat(os.fspath(path)),
+                                        starts, stops, itertools.repeat(iso)):
+                statistics.merge(self._wrap(partial))
+
+        return statistics
+
+    def _wrap(self, signature_counts: Dict[int, np.ndarray]) -> PopulationStatistics:
+        """Wrap a worker's partial histograms as statistics"""
+        statistics = self.empty_statistics()
+        statistics.signature_counts = signature_counts
+        return statistics
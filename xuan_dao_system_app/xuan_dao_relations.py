@@ -0,0 +1,120 @@
+# 🕸️ XUÁN DÀO RELATIONS: THE WEB BETWEEN ALL THINGS 🕸️
+
+import numpy as np
+
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+from xuan_dao_structures import Element, ElementRelation, ELEMENT_CODES
+from xuan_dao_core import XuanDaoCore
+
+
+class XuanDaoEntityRelations:
+    """
+    Element relations between every pair of entities - people, rooms, objects.
+
+    The relation of two entities depends only on their dominant elements, so the N x N
+    relation matrix is the 5x5 core relation matrix indexed by element codes. The pairs
+    holding one relation are unions of element-group products, which lets them be listed
+    sparsely without ever forming the dense matrix.
+    """
+
+    def __init__(self, core: XuanDaoCore):
+        """Initialize with reference to the XuanDaoCore"""
+        self.core = core
+
+    @staticmethod
+    def element_codes(elements: Union[Sequence[Element], np.ndarray]) -> np.ndarray:
+        """Convert a sequence of Elements, or an array of element codes, to element codes"""
+        if len(elements) and isinstance(elements[0], Element):
+            return np.array([ELEMENT_CODES[element] for element in elements], dtype=np.int8)
+        return np.asarray(elements, dtype=np.int8)
+
+    def relation_matrix(self, elements: Union[Sequence[Element], np.ndarray]) -> np.ndarray:
+        """
+        Compute the dense relation matrix between all entities.
+
+        Args:
+            elements: Dominant element of each entity
+
+        Returns:
+            numpy.ndarray: (N, N) int8 ElementRelation codes, row entity toward column entity
+        """
+        codes = self.element_codes(elements)
+        return self.core.relation_matrix[codes[:, None], codes[None, :]]
+
+    def iter_relation_blocks(self, elements: Union[Sequence[Element], np.ndarray],
+                             block_size: int = 4096) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Compute the relation matrix one block of rows at a time.
+
+        Yields:
+            tuple: (first row, (rows, N) int8 relation codes)
+        """
+        codes = self.element_codes(elements)
+        for start in range(0, len(codes), block_size):
+            yield start, self.core.relation_matrix[codes[start:start + block_size, None], codes[None, :]]
+
+    def relation_groups(self, elements: Union[Sequence[Element], np.ndarray],
+                        relation: ElementRelation) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        List the pairs holding a relation as products of element groups.
+
+        Args:
+            elements: Dominant element of each entity
+            relation: The relation to select
+
+        Returns:
+            list: (row entities, column entities) index pairs; every row entity holds the
+            relation toward every column entity of its pair
+        """
+        codes = self.element_codes(elements)
+        groups = [np.flatnonzero(codes == code) for code in range(len(ELEMENT_CODES))]
+
+        row_codes, col_codes = np.nonzero(self.core.relation_matrix == relation)
+        return [(groups[row], groups[col]) for row, col in zip(row_codes, col_codes)
+                if len(groups[row]) and len(groups[col])]
+
+    def relation_pairs(self, elements: Union[Sequence[Element], np.ndarray], relation: ElementRelation,
+                       include_self: bool = False,
+                       max_pairs: Optional[int] = 100_000_000) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        List the pairs holding a relation as sparse COO coordinates.
+
+        A relation common across many entities holds for a large share of all N x N pairs,
+        more than the dense int8 matrix would take once stored as index pairs. Callers that
+        need every pair of such a relation should iterate relation_groups instead.
+
+        Args:
+            elements: Dominant element of each entity
+            relation: The relation to select
+            include_self: Keep the (i, i) pairs of the SAME relation
+            max_pairs: Refuse to list more pairs than this (None for no limit)
+
+        Returns:
+            tuple: (rows, cols) index arrays, grouped by element pair; int32 unless there
+            are 2**31 entities or more
+        """
+        codes = self.element_codes(elements)
+        index_dtype = np.int32 if len(codes) < 2 ** 31 else np.int64
+        groups = self.relation_groups(codes, relation)
+
+        n_pairs = sum(len(row_group) * len(col_group) for row_group, col_group in groups)
+        if max_pairs is not None and n_pairs > max_pairs:
+            raise ValueError(f"{relation.name} holds for {n_pairs} pairs, more than max_pairs={max_pairs}; "
+                             f"use relation_groups to work with them as group products")
+
+        rows, cols = [], []
+        for row_group, col_group in groups:
+            group_rows = np.repeat(row_group.astype(index_dtype), len(col_group))
+            group_cols = np.tile(col_group.astype(index_dtype), len(row_group))
+
+            if relation == ElementRelation.SAME and not include_self:
+                distinct = group_rows != group_cols
+                group_rows, group_cols = group_rows[distinct], group_cols[distinct]
+
+            rows.append(group_rows)
+            cols.append(group_cols)
+
+        if not rows:
+            return np.array([], dtype=index_dtype), np.array([], dtype=index_dtype)
+        return np.concatenate(rows), np.concatenate(cols)
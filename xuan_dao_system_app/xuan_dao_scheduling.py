@@ -0,0 +1,305 @@
+# 📆 XUÁN DÀO SCHEDULING: CHOOSING THE DAYS THAT NOURISH 📆
+
+import datetime
+
+import numpy as np
+
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import List, Optional, Tuple
+
+from xuan_dao_structures import ElementBalance, ElementRelation, SeasonalStrength, ELEMENT_ORDER, ELEMENT_CODES
+from xuan_dao_core import XuanDaoCore, split_dates
+
+
+# 🌅 Ranked Day - A favorable day for a person
+@dataclass
+class RankedDay:
+    date: datetime.date  # Gregorian date
+    score: float  # Personal support score
+    day_code: int  # Position in the sixty-day cycle
+    balance: ElementBalance  # Element balance of the person
+    scheduler: "XuanDaoScheduler" = field(repr=False)  # Scheduler that ranked the day
+
+    @cached_property
+    def explanation(self) -> str:
+        """Why this day supports the person, built on first access"""
+        return self.scheduler.explain_day(self.day_code, self.balance, self.date.month)
+
+
+# 👥 Group Day - A favorable day for a group
+@dataclass
+class GroupDay:
+    date: datetime.date  # Gregorian date
+    score: float  # Collective score
+    mean_support: float  # Average personal support score
+    min_support: float  # Support score of the least supported participant
+    controlled_count: int  # Participants whose weakest element the day controls
+
+
+def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Select the k highest scores along the last axis without sorting the rest.
+
+    argpartition finds the k-th best score in linear time; everything above it is kept,
+    with the earliest of the scores tied with it, and only those k are sorted.
+
+    Returns:
+        numpy.ndarray: (..., k) indices, best first, earlier first on equal scores
+    """
+    scores = np.asarray(scores)
+    k = max(min(k, scores.shape[-1]), 0)
+    if k == 0:
+        return np.zeros(scores.shape[:-1] + (0,), dtype=np.intp)
+
+    kth = np.take_along_axis(scores, np.argpartition(-scores, k - 1, axis=-1)[..., k - 1:k], axis=-1)
+    ties = scores == kth
+    needed = k - (scores > kth).sum(axis=-1, keepdims=True)
+    selected = (scores > kth) | (ties & (np.cumsum(ties, axis=-1) <= needed))
+    indices = np.nonzero(selected)[-1].reshape(scores.shape[:-1] + (k,))
+
+    order = np.argsort(-np.take_along_axis(scores, indices, axis=-1), axis=-1, kind="stable")
+    return np.take_along_axis(indices, order, axis=-1)
+
+
+class XuanDaoScheduler:
+    """
+    Ranking of days by how well their energy supports a person's element balance.
+
+    A day's energy depends only on its day code in the sixty-day cycle and its month, and
+    a person's needs only on their strongest, weakest and recommended elements. Scores are
+    therefore read from small precomputed tables and evaluated over whole date ranges at once.
+    """
+
+    def __init__(self, core: XuanDaoCore):
+        """Initialize with reference to the XuanDaoCore"""
+        self.core = core
+
+        # How the day element relates to the person's weakest element
+        self.weakest_support = {
+            ElementRelation.SAME: 1.5,  # Reinforces it directly
+            ElementRelation.GENERATES: 2.0,  # Nourishes it
+            ElementRelation.GENERATED_BY: -0.5,  # Draws on it
+            ElementRelation.CONTROLS: -2.0,  # Restrains it
+            ElementRelation.CONTROLLED_BY: 0.5  # Is restrained by it
+        }
+        self.recommended_bonus = 1.0  # Day element is the one to cultivate
+        self.excess_penalty = 0.5  # Day element adds to the strongest
+
+        # Interaction quality of the day's stem and branch
+        self.quality_weights = {
+            "Strong elemental harmony": 0.5,
+            "Productive, generative energy": 0.5,
+            "Controlling, restrictive energy": -0.5,
+            "Mixed, complex energy": 0.0,
+            "In season, naturally supported energy": 0.5,
+            "Against seasonal energy, requiring adaptation": -0.5
+        }
+
+        # Support of day element (row) for a weakest element (column)
+        relation_scores = np.array([self.weakest_support[relation] for relation in ElementRelation], dtype=np.float32)
+        self.weakest_scores = relation_scores[core.relation_matrix]
+        self.day_quality_scores = np.array([self.quality_weights[quality]
+                                            for quality in core.day_element_qualities], dtype=np.float32)
+
+        # Season alignment of each day code (column) in each month (row), as calculate_daily_energy
+        # judges it from the day stem's element
+        codes = np.arange(60)
+        stem_strengths = core.seasonal_strength[:, core.stem_element_codes[codes % 10]]
+        self.day_season_scores = np.select(
+            [stem_strengths == SeasonalStrength.PROSPEROUS, stem_strengths == SeasonalStrength.DEAD],
+            [self.quality_weights["In season, naturally supported energy"],
+             self.quality_weights["Against seasonal energy, requiring adaptation"]], 0.0).astype(np.float32)
+
+        # A day element in season gives more support to the weakest element, one out of season less
+        day_strengths = core.seasonal_strength[:, core.day_combined_elements]
+        self.day_element_weights = core.seasonal_weight_table[day_strengths].astype(np.float32)
+
+        # Every balance signature against every month and day code
+        self.signature_day_scores = self.day_code_scores(core.balance_strongest, core.balance_weakest,
+                                                         core.balance_recommended)
+        controls = core.relation_matrix == ElementRelation.CONTROLS
+        self.signature_day_controls = controls[core.day_combined_elements[None, :], core.balance_weakest[:, None]]
+
+    def day_code_scores(self, strongest: np.ndarray, weakest: np.ndarray, recommended: np.ndarray) -> np.ndarray:
+        """
+        Score all sixty day codes in every month for arrays of balance patterns.
+
+        Support of the weakest element is weighted by the seasonal strength of the day
+        element in the month, and the day's season alignment adds its quality weight.
+
+        Args:
+            strongest, weakest, recommended: Element code arrays of length P
+
+        Returns:
+            numpy.ndarray: (P, 12, 60) support scores, indexed by month - 1 and day code
+        """
+        day_elements = self.core.day_combined_elements[None, None, :]
+        strongest = np.asarray(strongest)[:, None, None]
+        weakest = np.asarray(weakest)[:, None, None]
+        recommended = np.asarray(recommended)[:, None, None]
+
+        return (self.weakest_scores[day_elements, weakest] * self.day_element_weights[None, :, :]
+                + self.recommended_bonus * (day_elements == recommended)
+                - self.excess_penalty * (day_elements == strongest)
+                + self.day_quality_scores[None, None, :]
+                + self.day_season_scores[None, :, :]).astype(np.float32)
+
+    def date_range_codes(self, start_date: datetime.date,
+                         end_date: datetime.date) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Compute the month indices and day codes of an inclusive date range.
+
+        Returns:
+            tuple: (datetime64 dates, month indices (month - 1), day codes)
+        """
+        dates = np.arange(np.datetime64(start_date, "D"), np.datetime64(end_date, "D") + 1)
+        years, months, days = split_dates(dates)
+        return dates, np.asarray(months) - 1, self.core.calculate_day_codes(years, months, days)
+
+    def rank_days(self, balance: ElementBalance, start_date: datetime.date, end_date: datetime.date,
+                  k: int = 10) -> List[RankedDay]:
+        """
+        Rank the days of a date range for a person.
+
+        Args:
+            balance: The person's element balance
+            start_date, end_date: Inclusive date range
+            k: Number of days to return
+
+        Returns:
+            list: The k best days, best first, earlier dates first on equal scores
+        """
+        code_scores = self.day_code_scores([ELEMENT_CODES[balance.strongest]], [ELEMENT_CODES[balance.weakest]],
+                                           [ELEMENT_CODES[balance.recommended]])[0]
+        dates, month_indices, day_codes = self.date_range_codes(start_date, end_date)
+        scores = code_scores[month_indices, day_codes]
+
+        best = _top_k_indices(scores, k)
+        return [RankedDay(date=dates[i].astype(datetime.date), score=float(scores[i]), day_code=int(day_codes[i]),
+                          balance=balance, scheduler=self)
+                for i in best]
+
+    def rank_days_for_signatures(self, signature_codes: np.ndarray, start_date: datetime.date,
+                                 end_date: datetime.date, k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rank the days of a date range for many people at once.
+
+        People sharing a balance signature share a ranking, so each distinct signature is
+        ranked once and the result is gathered per person.
+
+        Args:
+            signature_codes: Balance signature codes from calculate_element_balance_codes
+            start_date, end_date: Inclusive date range
+            k: Number of days per person
+
+        Returns:
+            tuple: (dates, scores), both (P, k), best first
+        """
+        dates, month_indices, day_codes = self.date_range_codes(start_date, end_date)
+        scores = self.signature_day_scores[:, month_indices, day_codes]
+
+        best = _top_k_indices(scores, k)
+        best_scores = np.take_along_axis(scores, best, axis=1)
+
+        signature_codes = np.asarray(signature_codes)
+        return dates[best[signature_codes]], best_scores[signature_codes]
+
+    def optimize_group_days(self, birth_dates: np.ndarray, start_date: datetime.date, end_date: datetime.date,
+                            k: int = 10, control_penalty: float = 2.0, day_block: int = 4096) -> List[GroupDay]:
+        """
+        Find the days that best support a whole group.
+
+        The collective score of a day is the participants' mean support minus control_penalty
+        times the share of participants whose weakest element the day controls. The
+        participants x days score matrix factors through the balance signatures: participants
+        are reduced to a signature histogram once, and each block of days is scored as
+        histogram-weighted sums over the signature x day table.
+
+        Args:
+            birth_dates: Participants' birth dates, datetime64 or (N, 3) year/month/day
+            start_date, end_date: Inclusive date window
+            k: Number of days to return
+            control_penalty: Weight of the share of participants whose weakest element is controlled
+            day_block: Number of days scored per block
+
+        Returns:
+            list: The k best days, best first, earlier dates first on equal scores
+        """
+        if end_date < start_date:
+            raise ValueError(f"Empty date window: {start_date} to {end_date}")
+
+        signature_codes = self.core.calculate_element_balance_codes(*split_dates(birth_dates))
+        if len(signature_codes) == 0:
+            raise ValueError("A group needs at least one participant")
+
+        histogram = np.bincount(signature_codes, minlength=len(self.core.balance_signatures))
+        present = np.flatnonzero(histogram)
+        weights = histogram[present].astype(np.float64)
+        n_participants = weights.sum()
+        signature_scores = self.signature_day_scores[present]
+        signature_controls = self.signature_day_controls[present]
+
+        dates, month_indices, day_codes = self.date_range_codes(start_date, end_date)
+        mean_support = np.empty(len(dates))
+        min_support = np.empty(len(dates))
+        controlled_count = np.empty(len(dates), dtype=np.int64)
+
+        for start in range(0, len(dates), day_block):
+            block_months = month_indices[start:start + day_block]
+            block_codes = day_codes[start:start + day_block]
+            scores = signature_scores[:, block_months, block_codes]
+            controls = signature_controls[:, block_codes]
+
+            mean_support[start:start + day_block] = weights @ scores / n_participants
+            min_support[start:start + day_block] = scores.min(axis=0)
+            controlled_count[start:start + day_block] = weights @ controls
+
+        collective = mean_support - control_penalty * controlled_count / n_participants
+
+        best = _top_k_indices(collective, k)
+        return [GroupDay(date=dates[i].astype(datetime.date), score=float(collective[i]),
+                         mean_support=float(mean_support[i]), min_support=float(min_support[i]),
+                         controlled_count=int(controlled_count[i]))
+                for i in best]
+
+    def explain_day(self, day_code: int, balance: ElementBalance, month: Optional[int] = None) -> str:
+        """
+        Explain how a day supports a person's element balance.
+
+        Args:
+            day_code: Position of the day in the sixty-day cycle
+            balance: The person's element balance
+            month: Month of the day (1-12), to explain its seasonal strength
+
+        Returns:
+            str: Explanation text
+        """
+        day_element = ELEMENT_ORDER[self.core.day_combined_elements[day_code]]
+        stem = self.core.heavenly_stems[day_code % 10]
+        branch = self.core.earthly_branches[day_code % 12]
+        relation = ElementRelation(self.core.relation(ELEMENT_CODES[day_element], ELEMENT_CODES[balance.weakest]))
+
+        relation_phrases = {
+            ElementRelation.SAME: "reinforces your weakest {weakest} element directly",
+            ElementRelation.GENERATES: "nourishes your weakest {weakest} element",
+            ElementRelation.GENERATED_BY: "draws on your weakest {weakest} element",
+            ElementRelation.CONTROLS: "restrains your weakest {weakest} element",
+            ElementRelation.CONTROLLED_BY: "is held in check by your weakest {weakest} element"
+        }
+
+        explanation = f"{stem}{branch} day of {day_element.value} energy "
+        explanation += f"({self.core.day_element_qualities[day_code]}). "
+        explanation += f"Its {day_element.value} " + relation_phrases[relation].format(weakest=balance.weakest.value)
+        explanation += "."
+
+        if month is not None:
+            strength = SeasonalStrength(self.core.seasonal_strength[month - 1, ELEMENT_CODES[day_element]])
+            explanation += f" Its {day_element.value} is {strength.name.lower()} in this season."
+
+        if day_element == balance.recommended:
+            explanation += f" It carries {balance.recommended.value}, the element to cultivate."
+        if day_element == balance.strongest:
+            explanation += f" It adds to your already strongest {balance.strongest.value} element."
+
+        return explanation
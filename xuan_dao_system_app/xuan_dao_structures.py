@@ -1,6 +1,6 @@
 # ✨ XUÁN DÀO CORE MODEL: THE FIVE ESSENCES ✨
 
-from enum import Enum
+from enum import Enum, IntEnum, IntFlag
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 import datetime
@@ -16,12 +16,59 @@ class Element(Enum):
     METAL = "金"  # 金 - Refinement, precision, boundaries, structure
 
 
+# 🔢 Element Codes - array positions of the five elements for vectorized calculation
+ELEMENT_ORDER: Tuple[Element, ...] = tuple(Element)
+ELEMENT_CODES: Dict[Element, int] = {element: code for code, element in enumerate(ELEMENT_ORDER)}
+
+
+# 🔗 Element Relations - how one element stands toward another
+class ElementRelation(IntEnum):
+    SAME = 0  # 同 - Same element, resonance
+    GENERATES = 1  # 生 - Produces the other
+    GENERATED_BY = 2  # 被生 - Produced by the other
+    CONTROLS = 3  # 剋 - Restrains the other
+    CONTROLLED_BY = 4  # 被剋 - Restrained by the other
+
+
+# 🌡️ Seasonal Strength (旺相休囚死) - how strong an element stands in a season
+class SeasonalStrength(IntEnum):
+    PROSPEROUS = 0  # 旺 - Rules the season
+    STRONG = 1  # 相 - Produced by the ruling element
+    RESTING = 2  # 休 - Produces the ruling element, spent
+    TRAPPED = 3  # 囚 - Restrains the ruling element, held back
+    DEAD = 4  # 死 - Restrained by the ruling element
+
+
 # 🌓 Primal Duality - Yin Yang 陰陽
 class Polarity(Enum):
     YIN = "陰"  # 陰 - Receptive, dark, moon, female, passive
     YANG = "陽"  # 陽 - Creative, light, sun, male, active
 
 
+# 🎎 Ten Gods (十神 Shi Shen) - how a stem stands toward the Day Master
+class TenGod(IntEnum):
+    FRIEND = 0  # 比肩 - Same element, same polarity
+    ROB_WEALTH = 1  # 劫財 - Same element, opposite polarity
+    EATING_GOD = 2  # 食神 - Produced by the Day Master, same polarity
+    HURTING_OFFICER = 3  # 傷官 - Produced by the Day Master, opposite polarity
+    INDIRECT_RESOURCE = 4  # 偏印 - Produces the Day Master, same polarity
+    DIRECT_RESOURCE = 5  # 正印 - Produces the Day Master, opposite polarity
+    INDIRECT_WEALTH = 6  # 偏財 - Restrained by the Day Master, same polarity
+    DIRECT_WEALTH = 7  # 正財 - Restrained by the Day Master, opposite polarity
+    SEVEN_KILLINGS = 8  # 七殺 - Restrains the Day Master, same polarity
+    DIRECT_OFFICER = 9  # 正官 - Restrains the Day Master, opposite polarity
+
+
+# ⚡ Branch Relations (沖合刑害) - bit flags of how two earthly branches meet
+class BranchRelation(IntFlag):
+    NONE = 0
+    CLASH = 1  # 沖 - Six Clashes, opposite branches
+    COMBINATION = 2  # 合 - Six Combinations
+    HARMONY = 4  # 三合 - Members of the same Three Harmonies frame
+    PUNISHMENT = 8  # 刑 - Punishments, including self-punishment
+    HARM = 16  # 害 - Six Harms
+
+
 # 🌱 Cosmic Phases - Wu De 五德
 class Phase(Enum):
     BIRTH = "生"  # 生 - Beginning, initiation, emergence
@@ -97,6 +144,16 @@ class StemBranch:
     combined_element: Element  # Dominant element
 
 
+# 🀄 Four Pillars (四柱 Si Zhu) - Birth chart of year, month, day and hour
+@dataclass
+class FourPillars:
+    year: StemBranch  # Year pillar
+    month: StemBranch  # Month pillar
+    day: StemBranch  # Day pillar - its stem is the Day Master
+    hour: StemBranch  # Hour pillar
+    codes: Tuple[int, int, int, int]  # Sexagenary indices (0-59) of the four pillars
+
+
 # 🔄 Day Energy - Daily cosmic pattern
 @dataclass
 class DayEnergy:
@@ -133,6 +190,62 @@ class Hexagram:
     changing_lines: List[int]  # Lines that are changing (0-5)
 
 
+# 🔢 Hexagram Code - six lines packed into bits, bottom line first
+@dataclass(frozen=True)
+class HexagramCode:
+    __slots__ = ("code", "changing")
+    code: int  # Bit i is line i: 1 = Yang, 0 = Yin
+    changing: int  # Bit i is set when line i is changing
+
+    def __post_init__(self):
+        """Keep both masks within six bits"""
+        if not (0 <= self.code < 64 and 0 <= self.changing < 64):
+            raise ValueError(f"Hexagram code and changing mask must be 6-bit values, "
+                             f"got code={self.code}, changing={self.changing}")
+
+    @classmethod
+    def from_lines(cls, lines: List[int], changing_lines: Optional[List[int]] = None) -> "HexagramCode":
+        """Pack six lines (bottom to top) and changing line indices into a code"""
+        if len(lines) != 6 or any(line not in (0, 1) for line in lines):
+            raise ValueError(f"A hexagram needs exactly six lines of 0 or 1, got {list(lines)}")
+
+        code = 0
+        for i, line in enumerate(lines):
+            code |= int(line) << i
+
+        changing = 0
+        for i in changing_lines or []:
+            if not 0 <= i < 6:
+                raise ValueError(f"Changing line index must be between 0 and 5, got {i}")
+            changing |= 1 << int(i)
+
+        return cls(code, changing)
+
+    @property
+    def lines(self) -> List[int]:
+        """The six lines, bottom to top"""
+        return [(self.code >> i) & 1 for i in range(6)]
+
+    @property
+    def changing_lines(self) -> List[int]:
+        """Indices of the changing lines"""
+        return [i for i in range(6) if (self.changing >> i) & 1]
+
+    @property
+    def lower(self) -> int:
+        """Code of the lower trigram"""
+        return self.code & 0b111
+
+    @property
+    def upper(self) -> int:
+        """Code of the upper trigram"""
+        return self.code >> 3
+
+    def transformed(self) -> "HexagramCode":
+        """The hexagram after its changing lines change"""
+        return HexagramCode(self.code ^ self.changing, 0)
+
+
 # 🕉️ XUÁN DÀO INITIALIZATION: AWAKENING THE COSMIC PATTERNS 🕉️
 
 def initialize_five_elements() -> Dict[Element, ElementAttributes]:
@@ -269,7 +382,7 @@ def initialize_trigrams() -> Dict[str, Trigram]:
         name="震",
         pinyin="zhèn",
         meaning="The Arousing",
-        lines=(0, 1, 1),  # Solid line at bottom
+        lines=(1, 0, 0),  # Solid line at bottom
         element=Element.WOOD,
         polarity=Polarity.YANG,
         direction="east",
@@ -285,7 +398,7 @@ def initialize_trigrams() -> Dict[str, Trigram]:
         name="巽",
         pinyin="xùn",
         meaning="The Gentle",
-        lines=(1, 0, 0),  # Solid line at top
+        lines=(0, 1, 1),  # Broken line at bottom
         element=Element.WOOD,
         polarity=Polarity.YIN,
         direction="southeast",
@@ -569,4 +682,283 @@ def initialize_stems_branches() -> Tuple[List[str], List[str], Dict[str, Element
         "戌": Element.EARTH, "亥": Element.WATER  # Xu (Dog), Hai (Pig)
     }
 
-    return heavenly_stems, earthly_branches, stem_element_map, branch_element_map
\ No newline at end of file
+    return heavenly_stems, earthly_branches, stem_element_map, branch_element_map
+
+def initialize_hidden_stems() -> Dict[str, List[Tuple[str, float]]]:
+    """Reveal the heavenly stems hidden within each earthly branch"""
+    # 藏干 - Hidden Stems: main qi first, then middle and residual qi, with their weights
+    return {
+        "子": [("癸", 1.0)],  # Zi - pure Water
+        "丑": [("己", 0.6), ("癸", 0.3), ("辛", 0.1)],  # Chou - Earth storing Water and Metal
+        "寅": [("甲", 0.6), ("丙", 0.3), ("戊", 0.1)],  # Yin - Wood birthing Fire
+        "卯": [("乙", 1.0)],  # Mao - pure Wood
+        "辰": [("戊", 0.6), ("乙", 0.3), ("癸", 0.1)],  # Chen - Earth storing Wood and Water
+        "巳": [("丙", 0.6), ("戊", 0.3), ("庚", 0.1)],  # Si - Fire birthing Metal
+        "午": [("丁", 0.7), ("己", 0.3)],  # Wu - Fire with Earth
+        "未": [("己", 0.6), ("丁", 0.3), ("乙", 0.1)],  # Wei - Earth storing Fire and Wood
+        "申": [("庚", 0.6), ("壬", 0.3), ("戊", 0.1)],  # Shen - Metal birthing Water
+        "酉": [("辛", 1.0)],  # You - pure Metal
+        "戌": [("戊", 0.6), ("辛", 0.3), ("丁", 0.1)],  # Xu - Earth storing Metal and Fire
+        "亥": [("壬", 0.7), ("甲", 0.3)]  # Hai - Water birthing Wood
+    }
+
+
+def initialize_branch_relations() -> Dict[BranchRelation, List[Tuple[str, ...]]]:
+    """Map the clashes, combinations, harmonies, punishments and harms among the branches"""
+    return {
+        # 六沖 - Six Clashes
+        BranchRelation.CLASH: [("子", "午"), ("丑", "未"), ("寅", "申"), ("卯", "酉"), ("辰", "戌"), ("巳", "亥")],
+        # 六合 - Six Combinations
+        BranchRelation.COMBINATION: [("子", "丑"), ("寅", "亥"), ("卯", "戌"), ("辰", "酉"), ("巳", "申"), ("午", "未")],
+        # 三合 - Three Harmonies: Water, Wood, Fire and Metal frames
+        BranchRelation.HARMONY: [("申", "子", "辰"), ("亥", "卯", "未"), ("寅", "午", "戌"), ("巳", "酉", "丑")],
+        # 刑 - Ungrateful, bullying and rude punishments, and the four self-punishing branches
+        BranchRelation.PUNISHMENT: [("寅", "巳", "申"), ("丑", "戌", "未"), ("子", "卯"),
+                                    ("辰",), ("午",), ("酉",), ("亥",)],
+        # 六害 - Six Harms
+        BranchRelation.HARM: [("子", "未"), ("丑", "午"), ("寅", "巳"), ("卯", "辰"), ("申", "亥"), ("酉", "戌")]
+    }
+
+
+def initialize_na_yin() -> List[Tuple[str, Element]]:
+    """Sound the thirty Na Yin (納音) of the sixty-pillar cycle, one for each pair of pillars"""
+    return [
+        ("海中金", Element.METAL), ("爐中火", Element.FIRE),  # 甲子乙丑, 丙寅丁卯
+        ("大林木", Element.WOOD), ("路旁土", Element.EARTH),  # 戊辰己巳, 庚午辛未
+        ("劍鋒金", Element.METAL), ("山頭火", Element.FIRE),  # 壬申癸酉, 甲戌乙亥
+        ("澗下水", Element.WATER), ("城頭土", Element.EARTH),  # 丙子丁丑, 戊寅己卯
+        ("白蠟金", Element.METAL), ("楊柳木", Element.WOOD),  # 庚辰辛巳, 壬午癸未
+        ("泉中水", Element.WATER), ("屋上土", Element.EARTH),  # 甲申乙酉, 丙戌丁亥
+        ("霹靂火", Element.FIRE), ("松柏木", Element.WOOD),  # 戊子己丑, 庚寅辛卯
+        ("長流水", Element.WATER), ("沙中金", Element.METAL),  # 壬辰癸巳, 甲午乙未
+        ("山下火", Element.FIRE), ("平地木", Element.WOOD),  # 丙申丁酉, 戊戌己亥
+        ("壁上土", Element.EARTH), ("金箔金", Element.METAL),  # 庚子辛丑, 壬寅癸卯
+        ("覆燈火", Element.FIRE), ("天河水", Element.WATER),  # 甲辰乙巳, 丙午丁未
+        ("大驛土", Element.EARTH), ("釵釧金", Element.METAL),  # 戊申己酉, 庚戌辛亥
+        ("桑柘木", Element.WOOD), ("大溪水", Element.WATER),  # 壬子癸丑, 甲寅乙卯
+        ("沙中土", Element.EARTH), ("天上火", Element.FIRE),  # 丙辰丁巳, 戊午己未
+        ("石榴木", Element.WOOD), ("大海水", Element.WATER)  # 庚申辛酉, 壬戌癸亥
+    ]
+
+
+def initialize_hexagrams(trigrams: Dict[str, Trigram]) -> Dict[int, Hexagram]:
+    """Unfold the sixty-four hexagrams in the King Wen sequence"""
+    # (upper trigram, lower trigram, Chinese name, English name, description, judgment, image)
+    king_wen = [
+        ("乾", "乾", "乾為天", "The Creative", "Pure yang energy, heaven, creative force",
+         "The Creative works sublime success, furthering through perseverance.",
+         "The movement of heaven is power. Thus the superior person makes himself strong and untiring."),
+        ("坤", "坤", "坤為地", "The Receptive", "Pure yin energy, earth, receptive force",
+         "The Receptive brings about sublime success, furthering through the perseverance of a mare.",
+         "The earth's condition is receptive devotion. Thus the superior person who has breadth of character carries the outer world."),
+        ("坎", "震", "水雷屯", "Difficulty at the Beginning", "Chaotic first growth, sprouting through resistance",
+         "Early confusion holds promise; do not rush ahead, gather helpers.",
+         "Clouds and thunder. The superior person brings order out of confusion."),
+        ("艮", "坎", "山水蒙", "Youthful Folly", "Inexperience, the spring at the foot of the mountain",
+         "The teacher does not seek the pupil; the pupil must seek and ask sincerely.",
+         "A spring wells up at the foot of the mountain. The superior person nourishes character through thorough action."),
+        ("坎", "乾", "水天需", "Waiting", "Patient nourishment before the rain",
+         "Sincere waiting brings light and success; perseverance crosses the great water.",
+         "Clouds rise up to heaven. The superior person eats, drinks and is at ease while waiting."),
+        ("乾", "坎", "天水訟", "Conflict", "Opposing wills, heaven and water moving apart",
+         "Halting halfway brings good fortune; pressing on to the end brings misfortune.",
+         "Heaven and water go their opposite ways. The superior person weighs the beginning of every undertaking."),
+        ("坤", "坎", "地水師", "The Army", "Organized strength, discipline under a worthy leader",
+         "The army needs perseverance and a strong, experienced leader.",
+         "Water in the midst of the earth. The superior person increases the masses by generosity."),
+        ("坎", "坤", "水地比", "Holding Together", "Union, alliance, the waters joined on earth",
+         "Holding together brings good fortune; those who come late meet misfortune.",
+         "Water on the earth. The ancient kings bestowed states and kept friendly relations with the lords."),
+        ("巽", "乾", "風天小畜", "The Taming Power of the Small", "Gentle restraint, small accumulation",
+         "Dense clouds without rain; small forces restrain for now.",
+         "The wind drives across heaven. The superior person refines the outward aspect of his nature."),
+        ("乾", "兌", "天澤履", "Treading", "Conduct, stepping carefully behind the tiger",
+         "Treading on the tail of the tiger without being bitten; courtesy brings success.",
+         "Heaven above, the lake below. The superior person discriminates between high and low and steadies the people."),
+        ("坤", "乾", "地天泰", "Peace", "Heaven and earth in communion, flourishing",
+         "The small departs, the great approaches; good fortune and success.",
+         "Heaven and earth unite. The ruler completes and regulates the course of heaven and earth."),
+        ("乾", "坤", "天地否", "Standstill", "Stagnation, heaven and earth out of touch",
+         "The great departs, the small approaches; the perseverance of the superior person is not furthered.",
+         "Heaven and earth do not unite. The superior person falls back on inner worth and avoids difficulties."),
+        ("乾", "離", "天火同人", "Fellowship with Men", "Community, shared purpose in the open",
+         "Fellowship in the open succeeds; it furthers to cross the great water.",
+         "Heaven together with fire. The superior person organizes the clans and distinguishes things."),
+        ("離", "乾", "火天大有", "Possession in Great Measure", "Abundance, fire shining high in heaven",
+         "Possession in great measure brings supreme success.",
+         "Fire in heaven above. The superior person curbs evil, furthers good, and obeys the will of heaven."),
+        ("坤", "艮", "地山謙", "Modesty", "Humility, the mountain within the earth",
+         "Modesty creates success; the superior person carries things through.",
+         "Within the earth, a mountain. The superior person reduces what is too much and augments what is too little."),
+        ("震", "坤", "雷地豫", "Enthusiasm", "Readiness, thunder rising from the earth",
+         "Enthusiasm furthers the installing of helpers and the setting of armies to march.",
+         "Thunder comes resounding out of the earth. The ancient kings made music to honor merit."),
+        ("兌", "震", "澤雷隨", "Following", "Adapting, following the movement of the time",
+         "Following has supreme success; perseverance furthers, without blame.",
+         "Thunder in the middle of the lake. At nightfall the superior person goes indoors to rest."),
+        ("艮", "巽", "山風蠱", "Work on What Has Been Spoiled", "Decay and its repair",
+         "Work on what has been spoiled has supreme success; consider three days before and after.",
+         "The wind blows low on the mountain. The superior person stirs up the people and strengthens their spirit."),
+        ("坤", "兌", "地澤臨", "Approach", "Advance, the rise of the light",
+         "Approach has supreme success; but by the eighth month there will be misfortune.",
+         "The earth above the lake. The superior person is inexhaustible in teaching and in tolerance."),
+        ("巽", "坤", "風地觀", "Contemplation", "Observation, the wind over the earth",
+         "The ablution has been made, not yet the offering; full of trust they look up.",
+         "The wind blows over the earth. The ancient kings visited the regions and gave instruction."),
+        ("離", "震", "火雷噬嗑", "Biting Through", "Decisive removal of obstacles, justice",
+         "Biting through has success; it furthers to let justice be administered.",
+         "Thunder and lightning. The ancient kings made firm the laws through clearly defined penalties."),
+        ("艮", "離", "山火賁", "Grace", "Adornment, form and beauty",
+         "Grace has success; in small matters it furthers to undertake something.",
+         "Fire at the foot of the mountain. The superior person clarifies current affairs but does not decide controversial issues."),
+        ("艮", "坤", "山地剝", "Splitting Apart", "Decline, the mountain resting on the earth",
+         "It does not further one to go anywhere.",
+         "The mountain rests on the earth. Those above secure their position only by giving generously to those below."),
+        ("坤", "震", "地雷復", "Return", "Turning point, the light returning",
+         "Return brings success; going out and coming in without error, friends come without blame.",
+         "Thunder within the earth. The ancient kings closed the passes at the time of solstice."),
+        ("乾", "震", "天雷無妄", "Innocence", "The unexpected, acting without guile",
+         "Innocence brings supreme success; one who is not as he should be meets misfortune.",
+         "Under heaven thunder rolls. The ancient kings nourished all beings in harmony with the time."),
+        ("艮", "乾", "山天大畜", "The Taming Power of the Great", "Great accumulation held firm",
+         "Perseverance furthers; not eating at home brings good fortune.",
+         "Heaven within the mountain. The superior person acquaints himself with many sayings of antiquity."),
+        ("艮", "震", "山雷頤", "The Corners of the Mouth", "Nourishment, what one takes in",
+         "Perseverance brings good fortune; pay heed to the providing of nourishment.",
+         "At the foot of the mountain, thunder. The superior person is careful of his words and temperate in eating."),
+        ("兌", "巽", "澤風大過", "Preponderance of the Great", "Excess, the ridgepole sagging",
+         "The ridgepole sags to the breaking point; it furthers to have somewhere to go.",
+         "The lake rises above the trees. The superior person stands alone unconcerned and renounces the world undaunted."),
+        ("坎", "坎", "坎為水", "The Abysmal", "Danger repeated, water flowing on",
+         "If you are sincere, you have success in your heart; whatever you do succeeds.",
+         "Water flows on uninterruptedly. The superior person walks in lasting virtue and carries on teaching."),
+        ("離", "離", "離為火", "The Clinging", "Clarity, fire doubled",
+         "Perseverance furthers; care of the cow brings good fortune.",
+         "That which is bright rises twice. The great person illumines the four quarters of the world."),
+        ("兌", "艮", "澤山咸", "Influence", "Attraction, mutual courtship",
+         "Influence brings success; to take a maiden to wife brings good fortune.",
+         "A lake on the mountain. The superior person encourages people to approach by his readiness to receive them."),
+        ("震", "巽", "雷風恆", "Duration", "Constancy, the enduring union",
+         "Duration brings success without blame; perseverance furthers.",
+         "Thunder and wind. The superior person stands firm and does not change direction."),
+        ("乾", "艮", "天山遯", "Retreat", "Withdrawal at the right time",
+         "Retreat brings success; in what is small, perseverance furthers.",
+         "Mountain under heaven. The superior person keeps the inferior at a distance, not angrily but with reserve."),
+        ("震", "乾", "雷天大壯", "The Power of the Great", "Great strength held to what is right",
+         "The power of the great: perseverance furthers.",
+         "Thunder in heaven above. The superior person does not tread upon paths that do not accord with order."),
+        ("離", "坤", "火地晉", "Progress", "Rapid advance, the sun rising over the earth",
+         "The powerful prince is honored with horses in large numbers.",
+         "The sun rises over the earth. The superior person brightens his own bright virtue."),
+        ("坤", "離", "地火明夷", "Darkening of the Light", "Injury, the light hidden within",
+         "In adversity it furthers one to be persevering.",
+         "The light has sunk into the earth. The superior person veils his light, yet still shines."),
+        ("巽", "離", "風火家人", "The Family", "The clan, order within the household",
+         "The perseverance of the woman furthers.",
+         "Wind comes forth from fire. The superior person has substance in his words and duration in his way of life."),
+        ("離", "兌", "火澤睽", "Opposition", "Estrangement, fire and lake moving apart",
+         "In small matters, good fortune.",
+         "Above, fire; below, the lake. Amid all fellowship the superior person retains his individuality."),
+        ("坎", "艮", "水山蹇", "Obstruction", "Difficulty, water on the mountain",
+         "The southwest furthers, the northeast does not; it furthers to see the great person.",
+         "Water on the mountain. The superior person turns his attention to himself and molds his character."),
+        ("震", "坎", "雷水解", "Deliverance", "Release, the storm clearing the air",
+         "The southwest furthers; returning brings good fortune, and where there is still something to do, hastening brings good fortune.",
+         "Thunder and rain set in. The superior person pardons mistakes and forgives misdeeds."),
+        ("艮", "兌", "山澤損", "Decrease", "Simplification, giving from below to above",
+         "Decrease combined with sincerity brings supreme good fortune without blame.",
+         "At the foot of the mountain, the lake. The superior person controls his anger and restrains his instincts."),
+        ("巽", "震", "風雷益", "Increase", "Gain, giving from above to below",
+         "It furthers one to undertake something and to cross the great water.",
+         "Wind and thunder. When the superior person sees good he imitates it; when he has faults he rids himself of them."),
+        ("兌", "乾", "澤天夬", "Breakthrough", "Resoluteness, the final push",
+         "One must resolutely make the matter known at the court of the king.",
+         "The lake has risen up to heaven. The superior person dispenses riches downward and refrains from resting on his virtue."),
+        ("乾", "巽", "天風姤", "Coming to Meet", "Encounter, the yin returning",
+         "The maiden is powerful; one should not marry such a maiden.",
+         "Under heaven, wind. The prince acts when disseminating his commands and proclaiming them to the four quarters."),
+        ("兌", "坤", "澤地萃", "Gathering Together", "Assembly around a center",
+         "Gathering together brings success; to bring great offerings creates good fortune.",
+         "The lake rises over the earth. The superior person renews his weapons to meet the unforeseen."),
+        ("坤", "巽", "地風升", "Pushing Upward", "Ascent, the tree growing within the earth",
+         "Pushing upward has supreme success; departure toward the south brings good fortune.",
+         "Within the earth, wood grows. The superior person heaps up small things to achieve something high and great."),
+        ("兌", "坎", "澤水困", "Oppression", "Exhaustion, the lake drained of water",
+         "Oppression: success for the great person who perseveres; words are not believed.",
+         "There is no water in the lake. The superior person stakes his life on following his will."),
+        ("坎", "巽", "水風井", "The Well", "The inexhaustible source that nourishes all",
+         "The town may be changed, but the well cannot be changed.",
+         "Water over wood. The superior person encourages the people at their work and exhorts them to help one another."),
+        ("兌", "離", "澤火革", "Revolution", "Molting, radical change in its time",
+         "On your own day you are believed; supreme success, remorse disappears.",
+         "Fire in the lake. The superior person sets the calendar in order and makes the seasons clear."),
+        ("離", "巽", "火風鼎", "The Cauldron", "Nourishment of the worthy, transformation",
+         "The cauldron brings supreme good fortune and success.",
+         "Fire over wood. The superior person consolidates his fate by making his position correct."),
+        ("震", "震", "震為雷", "The Arousing", "Shock, thunder repeated",
+         "Shock brings success; the shock terrifies for a hundred miles, yet he does not let fall the sacrificial spoon.",
+         "Thunder repeated. In fear and trembling the superior person sets his life in order and examines himself."),
+        ("艮", "艮", "艮為山", "Keeping Still", "Stillness, mountains standing together",
+         "Keeping his back still so that he no longer feels his body; no blame.",
+         "Mountains standing close together. The superior person does not permit his thoughts to go beyond his situation."),
+        ("巽", "艮", "風山漸", "Development", "Gradual progress, the tree on the mountain",
+         "The maiden is given in marriage; good fortune, perseverance furthers.",
+         "On the mountain, a tree. The superior person abides in dignity and virtue to improve the mores."),
+        ("震", "兌", "雷澤歸妹", "The Marrying Maiden", "Subordinate position, the limits of affection",
+         "Undertakings bring misfortune; nothing that would further.",
+         "Thunder over the lake. The superior person understands the transitory in the light of the eternity of the end."),
+        ("震", "離", "雷火豐", "Abundance", "Fullness at its zenith",
+         "Abundance has success; be not sad, be like the sun at midday.",
+         "Thunder and lightning come together. The superior person decides lawsuits and carries out punishments."),
+        ("離", "艮", "火山旅", "The Wanderer", "The traveler, fire on the mountain",
+         "Success through smallness; perseverance brings good fortune to the wanderer.",
+         "Fire on the mountain. The superior person is clear-minded and cautious in imposing penalties."),
+        ("巽", "巽", "巽為風", "The Gentle", "Penetration, wind following wind",
+         "The gentle: success through what is small; it furthers to see the great person.",
+         "Winds following one upon the other. The superior person spreads his commands abroad and carries out his undertakings."),
+        ("兌", "兌", "兌為澤", "The Joyous", "Joy, lakes resting one on the other",
+         "The joyous: success, perseverance is favorable.",
+         "Lakes resting one on the other. The superior person joins with his friends for discussion and practice."),
+        ("巽", "坎", "風水渙", "Dispersion", "Dissolution, wind over water",
+         "Dispersion brings success; the king approaches his temple.",
+         "The wind drives over the water. The ancient kings sacrificed to the Lord and built temples."),
+        ("坎", "兌", "水澤節", "Limitation", "Measure, water held within the lake's banks",
+         "Limitation brings success; galling limitation must not be persevered in.",
+         "Water over the lake. The superior person creates number and measure and examines the nature of virtue."),
+        ("巽", "兌", "風澤中孚", "Inner Truth", "Sincerity, the open center",
+         "Pigs and fishes; good fortune. It furthers to cross the great water.",
+         "Wind over the lake. The superior person discusses criminal cases in order to delay executions."),
+        ("震", "艮", "雷山小過", "Preponderance of the Small", "Small excess, the flying bird",
+         "Small things may be done, great things should not be done.",
+         "Thunder on the mountain. In conduct the superior person gives preponderance to reverence."),
+        ("坎", "離", "水火既濟", "After Completion", "Order achieved, every line in place",
+         "Success in small matters; at the beginning good fortune, at the end disorder.",
+         "Water over fire. The superior person takes thought of misfortune and arms himself against it in advance."),
+        ("離", "坎", "火水未濟", "Before Completion", "Transition, the work not yet finished",
+         "Before completion: success. The little fox that wets its tail has nothing that would further.",
+         "Fire over water. The superior person is careful in differentiating things so that each finds its place.")
+    ]
+
+    return {
+        number: Hexagram(
+            upper_trigram=trigrams[upper],
+            lower_trigram=trigrams[lower],
+            number=number,
+            chinese_name=chinese_name,
+            english_name=english_name,
+            description=description,
+            judgment=judgment,
+            image=image,
+            changing_lines=[]
+        )
+        for number, (upper, lower, chinese_name, english_name, description, judgment, image) in enumerate(king_wen, start=1)
+    }
+
+
+def initialize_casting_methods() -> Dict[str, Tuple[float, float, float, float]]:
+    """Set out the line probabilities of the traditional casting methods"""
+    # Probability of each line value: 6 old yin, 7 young yang, 8 young yin, 9 old yang
+    return {
+        "coins": (2 / 16, 6 / 16, 6 / 16, 2 / 16),  # 三錢 - Three coins
+        "yarrow": (1 / 16, 5 / 16, 7 / 16, 3 / 16)  # 蓍草 - Fifty yarrow stalks
+    }
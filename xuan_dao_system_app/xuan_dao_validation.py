@@ -0,0 +1,256 @@
+# ⚖️ XUÁN DÀO VALIDATION: PROVING THE FAIRNESS OF THE CAST ⚖️
+
+import math
+
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+from xuan_dao_core import XuanDaoCore
+from xuan_dao_casting import CastingDistribution, XuanDaoCastingAnalysis
+
+
+# 🧮 Casting Accumulator - constant-size running statistics of a stream of casts
+@dataclass
+class CastingAccumulator:
+    n_casts: int = 0  # Number of casts seen
+    line_counts: np.ndarray = field(default_factory=lambda: np.zeros((6, 4), dtype=np.int64))  # Line values 6-9 at each position
+    changing_counts: np.ndarray = field(default_factory=lambda: np.zeros(7, dtype=np.int64))  # Casts by number of changing lines
+    code_counts: np.ndarray = field(default_factory=lambda: np.zeros(64, dtype=np.int64))  # Primary hexagram codes
+    transformed_counts: np.ndarray = field(default_factory=lambda: np.zeros(64, dtype=np.int64))  # Transformed hexagram codes
+    pair_sums: np.ndarray = field(default_factory=lambda: np.zeros(6, dtype=np.int64))  # Lag-1 code pairs: n, Σx, Σy, Σx², Σy², Σxy
+    last_code: Optional[int] = None  # Last code of the stream, joining consecutive chunks
+
+    def update(self, codes: np.ndarray, changing: np.ndarray):
+        """Fold a chunk of consecutive casts from the same stream into the statistics"""
+        codes = np.asarray(codes, dtype=np.int64)
+        changing = np.asarray(changing, dtype=np.int64)
+        transformed = codes ^ changing
+
+        self.n_casts += len(codes)
+        self.code_counts += np.bincount(codes, minlength=64)
+        self.transformed_counts += np.bincount(transformed, minlength=64)
+        self.changing_counts += np.bincount(_popcount6(changing), minlength=7)
+
+        # Line values minus 6 at each position: 6 old yin, 7 young yang, 8 young yin, 9 old yang
+        positions = np.arange(6)
+        yang = (codes[:, None] >> positions) & 1
+        moving = (changing[:, None] >> positions) & 1
+        value_index = np.where(moving == 1, 3 * yang, 2 - yang)
+        self.line_counts += np.bincount((positions * 4 + value_index).ravel(), minlength=24).reshape(6, 4)
+
+        # Serial pairs, including the pair spanning the previous chunk
+        series = codes if self.last_code is None else np.concatenate([[self.last_code], codes])
+        x, y = series[:-1], series[1:]
+        self.pair_sums += np.array([len(x), x.sum(), y.sum(), (x * x).sum(), (y * y).sum(), (x * y).sum()])
+        if len(series):
+            self.last_code = int(series[-1])
+
+    def merge(self, other: "CastingAccumulator") -> "CastingAccumulator":
+        """Merge the statistics of another, independent stream into this one"""
+        self.n_casts += other.n_casts
+        self.line_counts += other.line_counts
+        self.changing_counts += other.changing_counts
+        self.code_counts += other.code_counts
+        self.transformed_counts += other.transformed_counts
+        self.pair_sums += other.pair_sums
+        return self
+
+    def serial_correlation(self) -> float:
+        """Lag-1 Pearson correlation of consecutive hexagram codes"""
+        n, sx, sy, sxx, syy, sxy = (float(value) for value in self.pair_sums)
+        if n < 2:
+            return 0.0
+        covariance = sxy - sx * sy / n
+        variance = math.sqrt(max(sxx - sx * sx / n, 0.0) * max(syy - sy * sy / n, 0.0))
+        return covariance / variance if variance > 0 else 0.0
+
+
+# 📋 Validation Report - test statistics of an accumulated stream of casts
+@dataclass
+class ValidationReport:
+    accumulator: CastingAccumulator  # The merged running statistics
+    chi_square: Dict[str, Tuple[float, int, float]]  # Test name -> (statistic, degrees of freedom, p-value)
+    serial_correlation: Tuple[float, float, float]  # (correlation, z-score, two-sided p-value)
+
+    def passed(self, alpha: float = 0.001) -> bool:
+        """Whether no test rejects fairness at significance level alpha"""
+        p_values = [p for _, _, p in self.chi_square.values()] + [self.serial_correlation[2]]
+        return min(p_values) >= alpha
+
+
+def _popcount6(values: np.ndarray) -> np.ndarray:
+    """Number of set bits of 6-bit values"""
+    return (np.asarray(values)[..., None] >> np.arange(6) & 1).sum(axis=-1)
+
+
+def _chi_square_p_value(statistic: float, dof: int) -> float:
+    """Upper-tail p-value of a chi-square statistic (Wilson-Hilferty normal approximation)"""
+    if dof <= 0:
+        return 1.0
+    scale = 2.0 / (9.0 * dof)
+    z = ((statistic / dof) ** (1.0 / 3.0) - (1.0 - scale)) / math.sqrt(scale)
+    return 0.5 * math.erfc(z / math.sqrt(2.0))
+
+
+def _accumulate_casts(core: XuanDaoCore, method: Union[str, Sequence[float]], caster: str, n_casts: int,
+                      chunk_size: int, seed: np.random.SeedSequence) -> CastingAccumulator:
+    """Cast one stream chunk by chunk and fold it into an accumulator"""
+    rng = np.random.default_rng(seed)
+    accumulator = CastingAccumulator()
+
+    for start in range(0, n_casts, chunk_size):
+        size = min(chunk_size, n_casts - start)
+        if caster == "coins":
+            codes, changing = core.generate_hexagrams(size, rng)
+        else:
+            codes, changing = core.cast_hexagrams(size, method, rng)
+        accumulator.update(codes, changing)
+
+    return accumulator
+
+
+# Core of each worker process, created once by the pool initializer
+_worker_core: Optional[XuanDaoCore] = None
+
+
+def _initialize_worker():
+    """Create the core used by this worker process"""
+    global _worker_core
+    _worker_core = XuanDaoCore()
+
+
+def _accumulate_stream(method: Union[str, Sequence[float]], caster: str, n_casts: int, chunk_size: int,
+                       seed: np.random.SeedSequence) -> CastingAccumulator:
+    """Worker task: cast and accumulate one stream"""
+    return _accumulate_casts(_worker_core, method, caster, n_casts, chunk_size, seed)
+
+
+class XuanDaoCastingValidator:
+    """
+    Streaming statistical validation of the casting random number paths.
+
+    Casts are generated chunk by chunk through the batch casting functions and folded
+    into fixed-size histograms and running sums, so memory stays constant however many
+    casts are tested. The run is divided into fixed streams with their own child seeds;
+    streams can be spread over processes and their accumulators merged, and the result
+    depends only on the root seed. The histograms are tested against the exact casting
+    distribution with chi-square tests, and consecutive casts for serial correlation.
+    """
+
+    def __init__(self, core: XuanDaoCore, method: Union[str, Sequence[float]] = "yarrow", caster: str = "alias"):
+        """
+        Initialize with reference to the XuanDaoCore.
+
+        Args:
+            core: The XuanDaoCore
+            method: Casting method name, or probabilities of line values 6, 7, 8, 9
+            caster: "alias" to test cast_hexagrams, or "coins" to test the bitwise
+                three-coin generate_hexagrams (method must then be "coins")
+        """
+        if caster not in ("alias", "coins"):
+            raise ValueError(f"Unknown caster: {caster}")
+        if caster == "coins" and method != "coins":
+            raise ValueError("The bitwise coin caster only implements the coin method")
+
+        self.core = core
+        self.method = method
+        self.caster = caster
+        self.distribution = XuanDaoCastingAnalysis(core).distribution(method)
+
+    def accumulate(self, n_casts: int, chunk_size: int = 1_000_000, stream_size: int = 20_000_000,
+                   seed: Optional[int] = None, workers: int = 0) -> CastingAccumulator:
+        """
+        Generate casts and accumulate their statistics.
+
+        Args:
+            n_casts: Number of casts to generate
+            chunk_size: Casts generated at once (bounds the memory in use)
+            stream_size: Casts per independent stream (the unit of parallel work)
+            seed: Root seed for a reproducible run (fresh entropy if omitted)
+            workers: Number of worker processes (0 = run in this process)
+
+        Returns:
+            CastingAccumulator: Merged statistics of all streams
+        """
+        root = np.random.SeedSequence(seed)
+        sizes = [min(stream_size, n_casts - start) for start in range(0, n_casts, stream_size)]
+        seeds = root.spawn(len(sizes))
+
+        accumulator = CastingAccumulator()
+        if workers > 0:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_initialize_worker) as executor:
+                for partial in executor.map(_accumulate_stream, [self.method] * len(sizes), [self.caster] * len(sizes),
+                                            sizes, [chunk_size] * len(sizes), seeds):
+                    accumulator.merge(partial)
+        else:
+            for size, stream_seed in zip(sizes, seeds):
+                accumulator.merge(_accumulate_casts(self.core, self.method, self.caster, size, chunk_size, stream_seed))
+
+        return accumulator
+
+    def validate(self, n_casts: int, chunk_size: int = 1_000_000, stream_size: int = 20_000_000,
+                 seed: Optional[int] = None, workers: int = 0) -> ValidationReport:
+        """
+        Generate casts and test them against the exact casting distribution.
+
+        Args:
+            n_casts, chunk_size, stream_size, seed, workers: As for accumulate
+
+        Returns:
+            ValidationReport: Chi-square and serial-correlation results
+        """
+        return self.report(self.accumulate(n_casts, chunk_size, stream_size, seed, workers))
+
+    def report(self, accumulator: CastingAccumulator,
+               distribution: Optional[CastingDistribution] = None) -> ValidationReport:
+        """
+        Test accumulated statistics against a casting distribution.
+
+        Args:
+            accumulator: Accumulated statistics (possibly merged from many runs)
+            distribution: Expected distribution (the validator's method if omitted)
+
+        Returns:
+            ValidationReport: Chi-square and serial-correlation results
+        """
+        distribution = distribution or self.distribution
+        n = accumulator.n_casts
+
+        expected = {
+            "lines": np.broadcast_to(distribution.line_probabilities, (6, 4)),
+            "changing": distribution.changing_counts,
+            "codes": distribution.primary,
+            "transformed": distribution.transformed
+        }
+        observed = {
+            "lines": accumulator.line_counts,
+            "changing": accumulator.changing_counts,
+            "codes": accumulator.code_counts,
+            "transformed": accumulator.transformed_counts
+        }
+
+        chi_square = {}
+        for name, probabilities in expected.items():
+            counts = n * np.asarray(probabilities, dtype=np.float64)
+            possible = counts > 0
+
+            # One constraint per distribution: all of it for codes, one per line position for lines
+            constraints = 6 if name == "lines" else 1
+            dof = int(possible.sum()) - constraints
+
+            # Any cast in a cell the method cannot produce rejects it outright
+            if np.any(observed[name][~possible] > 0):
+                chi_square[name] = (math.inf, dof, 0.0)
+                continue
+
+            statistic = float((((observed[name] - counts) ** 2)[possible] / counts[possible]).sum())
+            chi_square[name] = (statistic, dof, _chi_square_p_value(statistic, dof))
+
+        correlation = accumulator.serial_correlation()
+        z_score = correlation * math.sqrt(max(int(accumulator.pair_sums[0]), 1))
+        serial = (correlation, z_score, math.erfc(abs(z_score) / math.sqrt(2.0)))
+
+        return ValidationReport(accumulator=accumulator, chi_square=chi_square, serial_correlation=serial)
@@ -5,9 +5,9 @@ import math
 import matplotlib.pyplot as plt
 import numpy as np
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
-from xuan_dao_structures import Element
+from xuan_dao_structures import Element, HexagramCode, ELEMENT_ORDER
 from xuan_dao_core import XuanDaoCore
 
 
@@ -248,6 +248,33 @@ class XuanDaoVisualizer:
 
         return fig
 
+    def create_element_dynamics_chart(self, series: np.ndarray) -> plt.Figure:
+        """
+        Create a visualization of element energies evolving through time.
+
+        Args:
+            series: (steps + 1, 5) time series from XuanDaoDynamics.simulate
+
+        Returns:
+            matplotlib.figure.Figure: Element dynamics visualization
+        """
+        # Create figure
+        fig, ax = plt.subplots(figsize=(10, 6))
+
+        # One line per element, in element order
+        for code, element in enumerate(ELEMENT_ORDER):
+            ax.plot(series[:, code], color=self.element_colors[element], linewidth=2, label=element.value)
+
+        # Add labels and title
+        ax.set_xlabel('Step')
+        ax.set_ylabel('Energy')
+        ax.set_title('五行流轉 - Five Element Dynamics')
+
+        # Add legend
+        ax.legend()
+
+        return fig
+
     def create_bagua_diagram(self, arrangement: str = "pre-heaven") -> plt.Figure:
         """
         Create a visual representation of the Eight Trigrams diagram.
@@ -338,17 +365,23 @@ class XuanDaoVisualizer:
 
         return fig
 
-    def visualize_hexagram(self, lines: List[int], changing_lines: Optional[List[int]] = None) -> plt.Figure:
+    def visualize_hexagram(self, lines: Union[HexagramCode, List[int]],
+                           changing_lines: Optional[List[int]] = None) -> plt.Figure:
         """
         Create a visual representation of a hexagram.
 
         Args:
-            lines: Six-line hexagram pattern
-            changing_lines: Indices of changing lines (optional)
+            lines: Six-line hexagram pattern, or a HexagramCode
+            changing_lines: Indices of changing lines (optional, taken from the code if omitted)
 
         Returns:
             matplotlib.figure.Figure: Hexagram visualization
         """
+        if isinstance(lines, HexagramCode):
+            if changing_lines is None:
+                changing_lines = lines.changing_lines
+            lines = lines.lines
+
         # Create figure
         fig, ax = plt.subplots(figsize=(6, 9))
 